@@ -8,6 +8,13 @@ with JIRA issue tracking, providing intelligent error analysis and solution matc
 __version__ = "1.0.0"
 __author__ = "AMD Verification Team"
 
-from .server import main
-
 __all__ = ["main"]
+
+
+def __getattr__(name):
+    # Importing .server pulls in mcp, psycopg2 and jira; defer it until main
+    # is used, so submodules like .utils can be imported on their own
+    if name == "main":
+        from .server import main
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
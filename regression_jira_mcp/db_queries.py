@@ -16,6 +16,15 @@ from .security import validate_query, SecurityError
 
 logger = logging.getLogger(__name__)
 
+# Most connections the pool opens; each thread running a query holds one
+# (and never more than one at a time)
+POOL_MAX_CONNECTIONS = 10
+
+
+def _test_object_run_table(project_name: str, regression_name: str) -> str:
+    """Quoted name of a regression's test_object_run table."""
+    return f'"{project_name}_{regression_name}_test_object_run"'
+
 
 class RegressionDB:
     """
@@ -36,8 +45,9 @@ class RegressionDB:
     def _connect(self):
         """Establish database connection pool"""
         try:
-            self.connection_pool = psycopg2.pool.SimpleConnectionPool(
-                1, 10,  # min and max connections
+            # Threaded pool: tool handlers run queries from worker threads
+            self.connection_pool = psycopg2.pool.ThreadedConnectionPool(
+                1, POOL_MAX_CONNECTIONS,  # min and max connections
                 database=os.getenv('PGDATABASE'),
                 host=os.getenv('PGHOST'),
                 port=int(os.getenv('PGPORT', 5432)),
@@ -57,8 +67,11 @@ class RegressionDB:
         conn = self.connection_pool.getconn()
         try:
             # Set connection to read-only mode (silent enforcement)
-            # PostgreSQL will reject any write operations at the connection level
-            conn.set_session(readonly=True, autocommit=True)
+            # PostgreSQL will reject any write operations at the connection level.
+            # In autocommit mode set_session() is a server round trip, and the
+            # setting persists on the pooled connection, so only do it once.
+            if not (conn.autocommit and conn.readonly):
+                conn.set_session(readonly=True, autocommit=True)
             yield conn
         finally:
             self.connection_pool.putconn(conn)
@@ -133,8 +146,7 @@ class RegressionDB:
                 if not row:
                     raise Exception(f"Regression run {regression_run_id} not found")
                 
-                project_name, regression_name = row
-                table_name = f'"{project_name}_{regression_name}_test_object_run"'
+                table_name = _test_object_run_table(*row)
                 self._table_cache[regression_run_id] = table_name
                 return table_name
     
@@ -236,7 +248,8 @@ class RegressionDB:
         test_name: str,
         regression_run_id: Optional[int] = None,
         project_name: Optional[str] = None,
-        regression_name: Optional[str] = None
+        regression_name: Optional[str] = None,
+        include_log_path: bool = False
     ) -> Optional[Dict]:
         """
         Get test details by test name.
@@ -246,6 +259,8 @@ class RegressionDB:
             regression_run_id: Regression run ID (optional)
             project_name: Project name (optional)
             regression_name: Regression name (optional)
+            include_log_path: Also resolve the failed job's log file (as
+                'log_file_path', same as get_log_file_path) in the same query
             
         Returns:
             Test dictionary or None if not found
@@ -262,6 +277,17 @@ class RegressionDB:
         
         table_name = self.get_table_name(regression_run_id)
         
+        log_path_column = ""
+        if include_log_path:
+            log_path_column = f""",
+            (
+                SELECT jc.log_file
+                FROM job.job_cmd_{regression_run_id} jc
+                WHERE jc.job_run_ref = tor.failed_job_run_ref
+                ORDER BY jc.job_cmd_id DESC
+                LIMIT 1
+            ) AS log_file"""
+        
         query = f"""
         SELECT 
             tor.test_object_run_id,
@@ -281,7 +307,7 @@ class RegressionDB:
             tor.random_seed,
             tor.failed_job_run_ref,
             tor.mem_usage,
-            tor."lsf_req_MB" as lsf_req_MB
+            tor."lsf_req_MB" as lsf_req_MB{log_path_column}
         FROM {table_name} tor
         JOIN test_status ts ON tor.test_status_ref = ts.test_status_id
         JOIN test_object tobj ON tor.test_object_ref = tobj.test_object_id
@@ -301,7 +327,7 @@ class RegressionDB:
                 if not row:
                     return None
                 
-                return {
+                test = {
                     'test_object_run_id': row[0],
                     'test_name': row[1],
                     'block_name': row[2],
@@ -322,6 +348,10 @@ class RegressionDB:
                     'lsf_req_mb': row[17],
                     'regression_run_id': regression_run_id
                 }
+                if include_log_path:
+                    # No failed job means no log, as in get_log_file_path
+                    test['log_file_path'] = (row[18] or None) if row[15] else None
+                return test
     
     def get_log_file_path(
         self,
@@ -374,6 +404,48 @@ class RegressionDB:
         
         return None
     
+    def get_log_file_paths(
+        self,
+        test_object_run_ids: List[int],
+        regression_run_id: int
+    ) -> Dict[int, Optional[str]]:
+        """
+        Get log file paths for many failed tests in one query.
+        
+        Batch form of get_log_file_path: picks the same (latest) job_cmd
+        row per test, but with a single round trip for all tests.
+        
+        Args:
+            test_object_run_ids: Test object run IDs
+            regression_run_id: Regression run ID (shared by all tests)
+            
+        Returns:
+            Dict mapping each test_object_run_id to its log path or None
+        """
+        paths = {test_object_run_id: None for test_object_run_id in test_object_run_ids}
+        if not paths:
+            return paths
+        
+        table_name = self.get_table_name(regression_run_id)
+        
+        query = f"""
+        SELECT DISTINCT ON (tor.test_object_run_id)
+            tor.test_object_run_id,
+            jc.log_file
+        FROM {table_name} tor
+        JOIN job.job_cmd_{regression_run_id} jc ON jc.job_run_ref = tor.failed_job_run_ref
+        WHERE tor.test_object_run_id = ANY(%s)
+        ORDER BY tor.test_object_run_id, jc.job_cmd_id DESC
+        """
+        
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, (list(paths),))
+                for test_object_run_id, log_file in cur.fetchall():
+                    paths[test_object_run_id] = log_file or None
+        
+        return paths
+    
     def get_regression_summary(self, regression_run_id: int) -> Dict:
         """
         Get summary statistics for a regression run.
@@ -751,7 +823,7 @@ class RegressionDB:
     def _find_run_with_test(self, test_name: str) -> Optional[int]:
         """Find most recent regression run containing this test"""
         query = """
-        SELECT rr.regression_run_id, rr.start_time
+        SELECT rr.regression_run_id, p.project_name, r.regression_name
         FROM regression_run rr
         JOIN project p ON rr.project_ref = p.project_id
         JOIN regression r ON rr.regression_ref = r.regression_id
@@ -764,10 +836,15 @@ class RegressionDB:
                 cur.execute(query)
                 runs = cur.fetchall()
                 
-                # Check each run for the test
-                for run_id, _ in runs:
+                # Check each run for the test. Table names are built from this
+                # query's rows rather than get_table_name(), which would take
+                # a second pooled connection while this one is held.
+                for run_id, project_name, regression_name in runs:
                     try:
-                        table_name = self.get_table_name(run_id)
+                        table_name = self._table_cache.setdefault(
+                            run_id,
+                            _test_object_run_table(project_name, regression_name)
+                        )
                         check_query = f"""
                         SELECT tor.regression_run_ref
                         FROM {table_name} tor
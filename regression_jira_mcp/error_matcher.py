@@ -6,27 +6,50 @@ Calculates similarity scores and ranks JIRA results by relevance.
 """
 
 import re
-from typing import List, Dict, Optional, Tuple
+import importlib.util
+from typing import List, Dict, FrozenSet, Optional, Tuple
 from dataclasses import dataclass
 from .utils import (
     extract_keywords,
     clean_text_for_comparison,
-    calculate_keyword_similarity,
+    keyword_set,
+    keyword_set_similarity,
     SimilarityScore
 )
 
-try:
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.metrics.pairwise import cosine_similarity
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    SKLEARN_AVAILABLE = False
+# sklearn takes most of a second to import, so only probe for it here and
+# import it the first time text similarity is actually computed
+SKLEARN_AVAILABLE = importlib.util.find_spec('sklearn') is not None
 
+# Edit-distance ratio: rapidfuzz directly when installed (python-Levenshtein
+# >= 0.21 is a wrapper around it), otherwise python-Levenshtein itself
 try:
-    import Levenshtein
+    from rapidfuzz.distance.Indel import normalized_similarity as _edit_ratio
     LEVENSHTEIN_AVAILABLE = True
 except ImportError:
-    LEVENSHTEIN_AVAILABLE = False
+    try:
+        from Levenshtein import ratio as _edit_ratio
+        LEVENSHTEIN_AVAILABLE = True
+    except ImportError:
+        LEVENSHTEIN_AVAILABLE = False
+
+
+def _create_tfidf_vectorizer(**kwargs):
+    """Create a float32 TfidfVectorizer, importing sklearn on first use."""
+    import numpy as np
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    return TfidfVectorizer(dtype=np.float32, **kwargs)
+
+
+# Hardware/technical terms that make a keyword a better JIRA search term.
+# Matched as substrings of the lowercased keyword, in one regex search.
+TECHNICAL_TERMS = ['memory', 'allocation', 'dma', 'cache', 'buffer',
+                   'timeout', 'assertion', 'segmentation', 'fatal']
+_TECHNICAL_TERMS_RE = re.compile('|'.join(map(re.escape, TECHNICAL_TERMS)))
+
+# Words that mark a sentence as describing a fix, in priority order
+SOLUTION_KEYWORDS = ['solution', 'fix', 'resolved', 'patch', 'workaround', 'applied']
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]')
 
 
 @dataclass
@@ -38,7 +61,7 @@ class JiraMatch:
     status: str
     resolution: Optional[str]
     similarity_score: float  # 0.0 to 1.0
-    matching_keywords: List[str]
+    matching_keywords: Tuple[str, ...]
     relevance_reason: str
     solution_summary: Optional[str]
     link: str
@@ -52,7 +75,7 @@ class JiraMatch:
             'status': self.status,
             'resolution': self.resolution,
             'similarity_score': round(self.similarity_score, 2),
-            'matching_keywords': self.matching_keywords,
+            'matching_keywords': list(self.matching_keywords),
             'relevance_reason': self.relevance_reason,
             'solution_summary': self.solution_summary,
             'link': self.link
@@ -78,7 +101,8 @@ class ErrorMatcher:
         error_keywords: List[str],
         jira_issues: List[Dict],
         min_score: float = 0.3,
-        max_results: int = 10
+        max_results: int = 10,
+        prepared: Optional[List[Tuple[str, FrozenSet[str]]]] = None
     ) -> List[JiraMatch]:
         """
         Match and rank JIRA issues against test error.
@@ -89,6 +113,8 @@ class ErrorMatcher:
             jira_issues: List of JIRA issues from search
             min_score: Minimum similarity score (0.0-1.0)
             max_results: Maximum number of results to return
+            prepared: prepare_issues(jira_issues), when the same issues are
+                matched against several tests (built if None)
             
         Returns:
             List of JiraMatch objects, sorted by relevance
@@ -98,12 +124,28 @@ class ErrorMatcher:
         
         matches = []
         
-        for issue in jira_issues:
+        # Build issue texts once and score them against the error in a single
+        # TF-IDF fit, instead of refitting a vectorizer per issue
+        if prepared is None:
+            prepared = self.prepare_issues(jira_issues)
+        jira_texts = [jira_text for jira_text, _ in prepared]
+        error_keyword_set = keyword_set(error_keywords)
+        if self.use_sklearn:
+            text_scores = self._calculate_text_similarities(error_signature, jira_texts)
+        else:
+            text_scores = [None] * len(jira_issues)
+        
+        for issue, (jira_text, jira_keyword_set), text_score in zip(
+                jira_issues, prepared, text_scores):
             # Calculate similarity score
             score, reason, matching_kw = self._calculate_similarity(
                 error_signature,
                 error_keywords,
-                issue
+                issue,
+                jira_text=jira_text,
+                text_score=text_score,
+                error_keyword_set=error_keyword_set,
+                jira_keyword_set=jira_keyword_set
             )
             
             if score >= min_score:
@@ -130,12 +172,37 @@ class ErrorMatcher:
         
         return matches[:max_results]
     
+    def prepare_issues(self, jira_issues: List[Dict]) -> List[Tuple[str, FrozenSet[str]]]:
+        """
+        Build the per-issue inputs of match_jira_issues.
+        
+        These depend only on the issue, so a caller matching one set of
+        issues against many tests can build them once and pass them in.
+        
+        Args:
+            jira_issues: List of JIRA issues from search
+            
+        Returns:
+            (jira_text, keyword_set) for each issue, in input order
+        """
+        prepared = []
+        for issue in jira_issues:
+            jira_text = self._get_jira_text(issue)
+            prepared.append(
+                (jira_text, keyword_set(extract_keywords(jira_text, max_keywords=20)))
+            )
+        return prepared
+    
     def _calculate_similarity(
         self,
         error_signature: str,
         error_keywords: List[str],
-        jira_issue: Dict
-    ) -> Tuple[float, str, List[str]]:
+        jira_issue: Dict,
+        jira_text: Optional[str] = None,
+        text_score: Optional[float] = None,
+        error_keyword_set: Optional[FrozenSet[str]] = None,
+        jira_keyword_set: Optional[FrozenSet[str]] = None
+    ) -> Tuple[float, str, Tuple[str, ...]]:
         """
         Calculate similarity between error and JIRA issue.
         
@@ -148,28 +215,37 @@ class ErrorMatcher:
             error_signature: Error signature text
             error_keywords: Keywords from error
             jira_issue: JIRA issue dictionary
+            jira_text: Precomputed text of the issue (built if None)
+            text_score: Precomputed TF-IDF similarity (computed if None)
+            error_keyword_set: keyword_set(error_keywords) (built if None)
+            jira_keyword_set: Keyword set of jira_text (built if None)
             
         Returns:
             Tuple of (score, reason, matching_keywords)
         """
-        jira_text = self._get_jira_text(jira_issue)
-        jira_keywords = extract_keywords(jira_text, max_keywords=20)
+        if jira_text is None:
+            jira_text = self._get_jira_text(jira_issue)
+        if error_keyword_set is None:
+            error_keyword_set = keyword_set(error_keywords)
+        if jira_keyword_set is None:
+            jira_keyword_set = keyword_set(extract_keywords(jira_text, max_keywords=20))
         
         scores = []
         reasons = []
         
         # Method 1: Keyword matching (always available)
-        keyword_sim = calculate_keyword_similarity(error_keywords, jira_keywords)
+        keyword_sim = keyword_set_similarity(error_keyword_set, jira_keyword_set)
         scores.append(keyword_sim.score * 0.5)  # Weight: 50%
         if keyword_sim.score > 0.5:
             reasons.append(f"Keyword match: {keyword_sim}")
         
         # Method 2: Text similarity (if sklearn available)
         if self.use_sklearn:
-            text_score = self._calculate_text_similarity(
-                error_signature,
-                jira_text
-            )
+            if text_score is None:
+                text_score = self._calculate_text_similarity(
+                    error_signature,
+                    jira_text
+                )
             scores.append(text_score * 0.3)  # Weight: 30%
             if text_score > 0.5:
                 reasons.append(f"Text similarity: {int(text_score * 100)}%")
@@ -246,32 +322,56 @@ class ErrorMatcher:
         Returns:
             Similarity score (0.0 to 1.0)
         """
-        if not self.use_sklearn or not text1 or not text2:
-            return 0.0
+        return self._calculate_text_similarities(text1, [text2])[0]
+    
+    def _calculate_text_similarities(self, text: str, others: List[str]) -> List[float]:
+        """
+        Calculate TF-IDF cosine similarity of one text against many.
+        
+        A single vectorizer is fitted over all texts, so document
+        frequencies come from the whole candidate set rather than a pair.
+        
+        Args:
+            text: Reference text (e.g. error signature)
+            others: Texts to compare against
+            
+        Returns:
+            Similarity scores (0.0 to 1.0), one per entry in others
+        """
+        zeros = [0.0] * len(others)
+        
+        if not self.use_sklearn or not text or not others:
+            return zeros
         
         try:
             # Clean texts
-            clean1 = clean_text_for_comparison(text1)
-            clean2 = clean_text_for_comparison(text2)
+            clean = clean_text_for_comparison(text)
+            clean_others = [clean_text_for_comparison(o) if o else '' for o in others]
             
-            if not clean1 or not clean2:
-                return 0.0
+            if not clean or not any(clean_others):
+                return zeros
             
             # Calculate TF-IDF vectors
-            vectorizer = TfidfVectorizer(
+            vectorizer = _create_tfidf_vectorizer(
                 min_df=1,
                 max_df=0.9,
                 ngram_range=(1, 2),  # Unigrams and bigrams
                 stop_words='english'
             )
             
-            vectors = vectorizer.fit_transform([clean1, clean2])
-            similarity = cosine_similarity(vectors[0:1], vectors[1:2])[0][0]
+            # Rows are L2-normalized (TfidfVectorizer's default norm), so the
+            # cosine is a plain sparse dot product with the reference row
+            vectors = vectorizer.fit_transform([clean] + clean_others)
+            similarities = (vectors[1:] @ vectors[0].T).toarray().ravel()
             
-            return max(0.0, min(1.0, similarity))
+            # Empty texts have no vector and never count as similar
+            return [
+                max(0.0, min(1.0, float(sim))) if other else 0.0
+                for sim, other in zip(similarities, clean_others)
+            ]
         
         except Exception:
-            return 0.0
+            return zeros
     
     def _calculate_edit_similarity(self, text1: str, text2: str) -> float:
         """
@@ -294,7 +394,7 @@ class ErrorMatcher:
             text2 = text2[:max_len]
             
             # Calculate ratio
-            ratio = Levenshtein.ratio(text1.lower(), text2.lower())
+            ratio = _edit_ratio(text1.lower(), text2.lower())
             
             return max(0.0, min(1.0, ratio))
         
@@ -313,8 +413,6 @@ class ErrorMatcher:
         Returns:
             Solution summary or None
         """
-        solution_keywords = ['solution', 'fix', 'resolved', 'patch', 'workaround', 'applied']
-        
         # Check resolution field
         if jira_issue.get('resolution'):
             resolution = jira_issue['resolution']
@@ -323,25 +421,38 @@ class ErrorMatcher:
                 if jira_issue.get('comments'):
                     for comment in jira_issue['comments']:
                         if isinstance(comment, dict):
-                            body = comment.get('body', '').lower()
-                            for keyword in solution_keywords:
-                                if keyword in body:
-                                    # Extract sentence containing keyword
-                                    sentences = re.split(r'[.!?]', comment.get('body', ''))
-                                    for sentence in sentences:
-                                        if keyword in sentence.lower():
-                                            return sentence.strip()[:200]
+                            sentence = self._find_solution_sentence(comment.get('body', ''))
+                            if sentence is not None:
+                                return sentence
         
         # Check description
         if jira_issue.get('description'):
-            desc = jira_issue['description'].lower()
-            for keyword in solution_keywords:
-                if keyword in desc:
-                    # Extract sentence containing keyword
-                    sentences = re.split(r'[.!?]', jira_issue['description'])
-                    for sentence in sentences:
-                        if keyword in sentence.lower():
-                            return sentence.strip()[:200]
+            return self._find_solution_sentence(jira_issue['description'])
+        
+        return None
+    
+    def _find_solution_sentence(self, text: str) -> Optional[str]:
+        """
+        Find the first sentence mentioning the highest-priority solution keyword.
+        
+        Args:
+            text: Comment or description text
+            
+        Returns:
+            Sentence (truncated to 200 chars) or None if no keyword appears
+        """
+        if not text:
+            return None
+        
+        text_lower = text.lower()
+        keyword = next((kw for kw in SOLUTION_KEYWORDS if kw in text_lower), None)
+        if keyword is None:
+            return None
+        
+        # Split into sentences only once a keyword is known to be present
+        for sentence in _SENTENCE_SPLIT_RE.split(text):
+            if keyword in sentence.lower():
+                return sentence.strip()[:200]
         
         return None
     
@@ -356,11 +467,32 @@ class ErrorMatcher:
         Returns:
             Similarity score (0.0 to 1.0)
         """
-        keywords1 = extract_keywords(error1)
-        keywords2 = extract_keywords(error2)
+        return self._compare_errors_with_keywords(
+            error1, keyword_set(extract_keywords(error1)),
+            error2, keyword_set(extract_keywords(error2))
+        )
+    
+    def _compare_errors_with_keywords(
+        self,
+        error1: str,
+        keywords1: FrozenSet[str],
+        error2: str,
+        keywords2: FrozenSet[str]
+    ) -> float:
+        """
+        Compare two error signatures whose keywords are already extracted.
         
+        Args:
+            error1: First error signature
+            keywords1: keyword_set() of error1's keywords
+            error2: Second error signature
+            keywords2: keyword_set() of error2's keywords
+            
+        Returns:
+            Similarity score (0.0 to 1.0)
+        """
         # Keyword similarity
-        kw_sim = calculate_keyword_similarity(keywords1, keywords2)
+        kw_sim = keyword_set_similarity(keywords1, keywords2)
         score = kw_sim.score * 0.6
         
         # Add text similarity if available
@@ -389,13 +521,16 @@ class ErrorMatcher:
         """
         # Prioritize keywords that appear in error signature
         keyword_scores = {}
+        signature_lower = error_signature.lower()
         
         for kw in error_keywords:
+            kw_lower = kw.lower()
+            
             # Base score
             score = 1.0
             
             # Boost if appears in signature
-            if kw.lower() in error_signature.lower():
+            if kw_lower in signature_lower:
                 score += 2.0
             
             # Boost technical terms
@@ -403,9 +538,7 @@ class ErrorMatcher:
                 score += 1.0
             
             # Boost hardware/technical terms
-            technical_terms = ['memory', 'allocation', 'dma', 'cache', 'buffer',
-                             'timeout', 'assertion', 'segmentation', 'fatal']
-            if any(term in kw.lower() for term in technical_terms):
+            if _TECHNICAL_TERMS_RE.search(kw_lower):
                 score += 1.5
             
             keyword_scores[kw] = score
@@ -517,6 +650,9 @@ class ErrorMatcher:
         groups = []
         used = set()
         
+        # Extract each summary's keywords once rather than once per pair
+        keywords = [keyword_set(extract_keywords(m.summary)) for m in matches]
+        
         for i, match1 in enumerate(matches):
             if i in used:
                 continue
@@ -530,7 +666,10 @@ class ErrorMatcher:
                     continue
                 
                 # Compare summaries
-                similarity = self.compare_errors(match1.summary, match2.summary)
+                similarity = self._compare_errors_with_keywords(
+                    match1.summary, keywords[i],
+                    match2.summary, keywords[j]
+                )
                 if similarity >= threshold:
                     group.append(match2)
                     used.add(j)
@@ -558,10 +697,7 @@ def calculate_simple_similarity(text1: str, text2: str) -> float:
     if not keywords1 or not keywords2:
         return 0.0
     
-    intersection = keywords1.intersection(keywords2)
-    union = keywords1.union(keywords2)
-    
-    if not union:
-        return 0.0
+    # Union size is |A| + |B| - |A & B|; no need to build the union set
+    common = len(keywords1 & keywords2)
     
-    return len(intersection) / len(union)
+    return common / (len(keywords1) + len(keywords2) - common)
@@ -328,7 +328,7 @@ ERROR_PATTERNS = [
         'description': 'Signal still asserted at finish'
     },
     {
-        'pattern': re.compile(r'\d+ : fail'),
+        'pattern': re.compile(r'\d : fail'),  # Same lines as \d+, no backtracking over digit runs
         'level': 5,
         'pos': 'builtin:numbered_fail',
         'description': 'Numbered failure'
@@ -508,7 +508,7 @@ ERROR_PATTERNS = [
         'description': 'Simulation warnings error'
     },
     {
-        'pattern': re.compile(r'^db_mem_htile_check\.pl: [1-9]+[0-9]* errors found in checking'),
+        'pattern': re.compile(r'^db_mem_htile_check\.pl: [1-9][0-9]* errors found in checking'),
         'level': 5,
         'pos': 'builtin:htile_check',
         'description': 'H-tile check errors'
@@ -520,6 +520,35 @@ for pattern_dict in ERROR_PATTERNS:
     if not isinstance(pattern_dict['pattern'], re.Pattern):
         pattern_dict['pattern'] = re.compile(pattern_dict['pattern'])
 
+
+def _union_pattern(patterns) -> re.Pattern:
+    """
+    Combine compiled patterns into one alternation, keeping per-pattern flags.
+    
+    The union matches a line if and only if at least one input pattern does.
+    """
+    parts = []
+    for pattern in patterns:
+        if pattern.flags & re.IGNORECASE:
+            parts.append(f'(?i:{pattern.pattern})')
+        else:
+            parts.append(f'(?:{pattern.pattern})')
+    return re.compile('|'.join(parts))
+
+
+# Single-pass prefilter over all error patterns. Most log lines match none of
+# them, so one search here lets the analyzer skip the ordered per-pattern loop
+# (which decides level and pos) for the vast majority of lines.
+ERROR_PREFILTER = _union_pattern(p['pattern'] for p in ERROR_PATTERNS)
+
+# All ignore patterns as one regex: a line is ignored if any of them matches,
+# so a single search gives the same answer as looping over the list.
+COMPILED_IGNORE_UNION = _union_pattern(COMPILED_IGNORE_PATTERNS)
+
+# Highest severity any error pattern can report. Once a scan has matched an
+# error at this level nothing later in the log can replace it.
+MAX_ERROR_LEVEL = max(p['level'] for p in ERROR_PATTERNS)
+
 # ============================================================================
 # WARNING PATTERNS (Only used when warnings are treated as errors)
 # ============================================================================
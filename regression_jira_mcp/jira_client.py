@@ -6,12 +6,42 @@ Includes read-only protection layer to prevent data modification.
 """
 
 import os
+import re
 from typing import List, Dict, Optional
 from jira import JIRA
+from requests.adapters import HTTPAdapter
 from .utils import create_jira_url, extract_keywords
 from .security import validate_jira_operation, SecurityError
 
 
+# Keep-alive connections kept per JIRA host. requests' default of 10 is less
+# than the number of worker threads that can query JIRA at the same time, so
+# extra connections were dropped after each call and re-handshaked next time.
+HTTP_POOL_MAXSIZE = 32
+
+# Words that mark a sentence as describing a fix
+SOLUTION_KEYWORDS = ['solution', 'fix', 'resolved', 'patch', 'workaround',
+                     'applied', 'implemented', 'corrected', 'updated']
+_SOLUTION_RE = re.compile('|'.join(map(re.escape, SOLUTION_KEYWORDS)), re.IGNORECASE)
+
+
+def _first_solution_sentence(text: str) -> Optional[str]:
+    """
+    Return the first '.'-delimited sentence that mentions a solution keyword.
+    
+    One regex search over the whole text finds the earliest keyword; the
+    sentence around it is then sliced out, without splitting the text.
+    """
+    match = _SOLUTION_RE.search(text)
+    if not match:
+        return None
+    start = text.rfind('.', 0, match.start()) + 1
+    end = text.find('.', match.end())
+    if end == -1:
+        end = len(text)
+    return text[start:end].strip()[:200]
+
+
 class ReadOnlyJiraProxy:
     """
     Read-only proxy wrapper for JIRA client.
@@ -105,6 +135,12 @@ class JiraClient:
                 )
             )
             
+            # The session (and its auth) is shared by every call; widen its
+            # connection pool. Retries stay with jira's ResilientSession.
+            adapter = HTTPAdapter(pool_maxsize=HTTP_POOL_MAXSIZE)
+            self._raw_jira._session.mount('https://', adapter)
+            self._raw_jira._session.mount('http://', adapter)
+            
             # Wrap with read-only proxy for security
             # All method calls will be validated before reaching JIRA library
             self.jira = ReadOnlyJiraProxy(self._raw_jira)
@@ -347,9 +383,6 @@ class JiraClient:
         Returns:
             Solution summary or None
         """
-        solution_keywords = ['solution', 'fix', 'resolved', 'patch', 'workaround', 
-                           'applied', 'implemented', 'corrected', 'updated']
-        
         # Check resolution
         if issue_dict.get('resolution'):
             resolution = issue_dict['resolution'].lower()
@@ -357,22 +390,13 @@ class JiraClient:
                 # Look in comments
                 if issue_dict.get('comments'):
                     for comment in issue_dict['comments']:
-                        body = comment.get('body', '').lower()
-                        for keyword in solution_keywords:
-                            if keyword in body:
-                                # Extract sentences with solution keywords
-                                sentences = comment.get('body', '').split('.')
-                                for sentence in sentences:
-                                    if any(kw in sentence.lower() for kw in solution_keywords):
-                                        return sentence.strip()[:200]
+                        sentence = _first_solution_sentence(comment.get('body') or '')
+                        if sentence is not None:
+                            return sentence
                 
                 # Check description
                 if issue_dict.get('description'):
-                    desc = issue_dict['description']
-                    sentences = desc.split('.')
-                    for sentence in sentences:
-                        if any(kw in sentence.lower() for kw in solution_keywords):
-                            return sentence.strip()[:200]
+                    return _first_solution_sentence(issue_dict['description'])
         
         return None
     
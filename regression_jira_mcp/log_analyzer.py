@@ -8,15 +8,94 @@ Analyzes test log files to extract error signatures and relevant information.
 import re
 import os
 import gzip
+import io
 from typing import List, Optional, Tuple
 from dataclasses import dataclass
 from .error_patterns import (
-    COMPILED_IGNORE_PATTERNS,
+    COMPILED_IGNORE_UNION,
     ERROR_PATTERNS,
+    ERROR_PREFILTER,
+    MAX_ERROR_LEVEL,
     WARNING_PATTERNS
 )
 from .utils import extract_keywords, extract_keywords_from_test_name
 
+# Line classifiers used on every scanned line. Each regex is guarded by a
+# cheap literal test at the call site so most lines never enter the re engine.
+_ACTION_PREFIX = '# action: gc('
+_ACTION_RE = re.compile(r'# action: gc\(.*\)::(\w+)\/(\w+)\.(\S+)')
+_DV_RUNNING_TOOL_RE = re.compile(r'dv: \.\.\. running tool (\S+)')
+_DV_TOOL_FAILED_RE = re.compile(r'dv: tool (\S+) failed!')
+_SIMCTRL_SIGNAL_RE = re.compile(r'failed:\s+caught\s+signal\s+\d+')
+_WARNINGS_AS_ERRORS = 'cc1plus: warnings being treated as errors'
+
+# Bytes at the end of a log scanned first in 'tail_first' mode
+TAIL_FIRST_BYTES = 64 * 1024
+
+# A binary line split further on '\r\n' / lone '\r', keeping line endings
+_LINE_SPLIT_RE = re.compile(rb'[^\r\n]*(?:\r\n?|\n)|[^\r\n]+')
+
+# Block size for reading an uncompressed log backwards in get_log_tail
+TAIL_BLOCK_SIZE = 8192
+
+
+def _open_log_text(log_file_path: str):
+    """
+    Open a log file for text reading, transparently handling gzip.
+    
+    Raises FileNotFoundError if the file does not exist, so callers can
+    detect a missing log without a separate os.path.exists() check.
+    """
+    if log_file_path.endswith('.gz'):
+        return gzip.open(log_file_path, 'rt', encoding='utf-8', errors='ignore')
+    return open(log_file_path, 'r', encoding='utf-8', errors='ignore')
+
+
+def _count_newlines(log_file_path: str, end: int) -> int:
+    """
+    Count line breaks in the first `end` bytes of an uncompressed file.
+    
+    '\n', '\r\n' and a lone '\r' each count once, as in text mode.
+    """
+    count = 0
+    prev_cr = False
+    with open(log_file_path, 'rb') as f:
+        while end > 0:
+            chunk = f.read(min(end, 1 << 20))
+            if not chunk:
+                break
+            count += chunk.count(b'\n') + chunk.count(b'\r') - chunk.count(b'\r\n')
+            if prev_cr and chunk.startswith(b'\n'):
+                count -= 1  # '\r\n' split across chunks
+            prev_cr = chunk.endswith(b'\r')
+            end -= len(chunk)
+    return count
+
+
+def _read_tail(log_file_path: str, num_lines: int) -> str:
+    """
+    Read the last `num_lines` lines of an uncompressed file.
+    
+    Reads TAIL_BLOCK_SIZE blocks backwards from the end until enough
+    newlines have been seen, so the work is bounded by the size of the
+    tail rather than the size of the file.
+    """
+    blocks = []
+    newlines = 0
+    with open(log_file_path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        while pos > 0 and newlines <= num_lines:
+            size = min(TAIL_BLOCK_SIZE, pos)
+            pos -= size
+            f.seek(pos)
+            block = f.read(size)
+            newlines += block.count(b'\n')
+            blocks.append(block)
+    text = b''.join(reversed(blocks)).decode('utf-8', errors='ignore')
+    # Same newline translation as reading the file in text mode
+    lines = io.StringIO(text, newline=None).readlines()
+    return ''.join(lines[-num_lines:])
+
 
 @dataclass
 class ErrorSignature:
@@ -24,6 +103,14 @@ class ErrorSignature:
     Error signature extracted from log analysis.
     Corresponds to the Perl analyzeFailure return values.
     """
+    # Declared by hand (dataclass(slots=True) needs Python 3.10) so batch
+    # runs holding many signatures don't pay for a per-instance __dict__.
+    __slots__ = (
+        'suite', 'test', 'signature', 'tool', 'line_number', 'line_offset',
+        'error_level', 'error_line', 'pattern_pos', 'num_lines_scanned',
+        'error_keywords'
+    )
+    
     suite: str
     test: str
     signature: str              # The error signature/message
@@ -58,6 +145,9 @@ class LogAnalyzer:
     
     This class reads test log files and identifies error patterns using
     the same rules as the original Perl implementation.
+    
+    Instances hold only configuration and all compiled patterns are shared
+    at module level, so a single analyzer can be used from several threads.
     """
     
     def __init__(self, max_lines: Optional[int] = None, ends_only: Optional[int] = None):
@@ -70,26 +160,79 @@ class LogAnalyzer:
         """
         self.max_lines = max_lines
         self.ends_only = ends_only
-        self.history_size = 10
-        self.history: List[str] = []
         
     def analyze_failure(
         self,
         log_file_path: str,
         suite: Optional[str] = None,
         test: Optional[str] = None,
-        tool: Optional[str] = None
+        tool: Optional[str] = None,
+        stop_on_first_error: bool = False,
+        scan_mode: str = 'full'
     ) -> ErrorSignature:
         """
         Analyze a test failure log file.
         
         This is the Python equivalent of the Perl analyzeFailure subroutine.
         
+        With scan_mode='tail_first', the last TAIL_FIRST_BYTES of the file are
+        scanned first and a maximum-severity error found there is returned
+        without reading the rest; otherwise the whole file is scanned. This
+        is faster on large logs but may report a later error than a full
+        scan, and tool/suite context set before the tail is not seen.
+        
+        Args:
+            log_file_path: Path to the log file
+            suite: Test suite name (auto-detected if None)
+            test: Test name (auto-detected if None)
+            tool: Tool name (auto-detected if None)
+            stop_on_first_error: Stop scanning at the first error instead of
+                looking further for a higher-severity one
+            scan_mode: 'full' (default) or 'tail_first'
+            
+        Returns:
+            ErrorSignature object containing analysis results
+        """
+        if scan_mode == 'tail_first' and not log_file_path.endswith('.gz'):
+            try:
+                tail_start = os.path.getsize(log_file_path) - TAIL_FIRST_BYTES
+            except OSError:
+                tail_start = 0
+            
+            if tail_start > 0:
+                result = self._scan_log(
+                    log_file_path, suite, test, tool, stop_on_first_error,
+                    start_offset=tail_start
+                )
+                if result.error_level >= MAX_ERROR_LEVEL:
+                    # Line numbers are relative to the first whole tail line;
+                    # recount from the start of the file up to the error line
+                    result.line_number = _count_newlines(log_file_path, result.line_offset)
+                    if not result.error_line.endswith('\n'):
+                        result.line_number += 1  # Last line, no line break
+                    return result
+        
+        return self._scan_log(log_file_path, suite, test, tool, stop_on_first_error)
+    
+    def _scan_log(
+        self,
+        log_file_path: str,
+        suite: Optional[str],
+        test: Optional[str],
+        tool: Optional[str],
+        stop_on_first_error: bool,
+        start_offset: int = 0
+    ) -> ErrorSignature:
+        """
+        Scan a log file from start_offset (skipping its partial first line).
+        
         Args:
             log_file_path: Path to the log file
             suite: Test suite name (auto-detected if None)
             test: Test name (auto-detected if None)
             tool: Tool name (auto-detected if None)
+            stop_on_first_error: Stop scanning at the first error
+            start_offset: Byte offset to start at (uncompressed files only)
             
         Returns:
             ErrorSignature object containing analysis results
@@ -111,118 +254,138 @@ class LogAnalyzer:
         
         current_tool = tool
         max_lines_scanned = 0
-        skipped_to_end = False
+        skipped_to_end = start_offset > 0  # Tail scans never apply ends_only
         file_size = 0
-        
-        # Check if file exists
-        if not os.path.exists(log_file_path):
-            return self._create_error_signature(
-                suite or "unknown",
-                test or "unknown",
-                "Log file not found",
-                current_tool or "unknown",
-                0, 0, 1, "Log file not found",
-                "error:file_not_found", 0,
-                []
-            )
+        offset = 0  # Byte offset just past the current line
         
         try:
             # Handle gzipped files
+            # Files are read in binary mode so byte offsets can be tracked by
+            # summing line lengths instead of calling f.tell() per line.
             is_gzipped = log_file_path.endswith('.gz')
             
             if is_gzipped:
-                f = gzip.open(log_file_path, 'rt', encoding='utf-8', errors='ignore')
-                file_size = 0  # Can't easily get size for gzip in text mode
+                f = gzip.open(log_file_path, 'rb')
+                file_size = 0  # Uncompressed size is unknown without a full read
             else:
-                f = open(log_file_path, 'r', encoding='utf-8', errors='ignore')
-                # Get file size for regular files
-                f.seek(0, 2)
-                file_size = f.tell()
-                f.seek(0)
+                f = open(log_file_path, 'rb')
+                file_size = os.fstat(f.fileno()).st_size
+                if start_offset:
+                    f.seek(start_offset)
+                    # Skip partial line
+                    offset = start_offset + len(f.readline())
             
             try:
-                # Read and process log file
-                for line_num, line in enumerate(f, 1):
-                    # Update history (for advanced pattern matching)
-                    self.history.insert(0, line)
-                    if len(self.history) > self.history_size:
-                        self.history.pop()
+                # Read and process log file. Lines are split on '\n' by the
+                # binary reader, then on '\r\n' / lone '\r' like text mode
+                # (simulator progress output), each piece counting as a line.
+                line_num = 0
+                stop = False
+                for raw_line in f:
+                    if b'\r' in raw_line:
+                        pieces = _LINE_SPLIT_RE.findall(raw_line)
+                    else:
+                        pieces = (raw_line,)
                     
-                    max_lines_scanned += 1
-                    
-                    # Check line limit
-                    if self.max_lines and max_lines_scanned > self.max_lines:
-                        first_error = f"unknown, did not find error in first {self.max_lines} lines"
-                        break
-                    
-                    # Handle ends_only (scan only file head and tail)
-                    # Skip for gzipped files as they don't support seeking in text mode
-                    if self.ends_only and not skipped_to_end and not is_gzipped:
-                        current_pos = f.tell()
-                        if current_pos > self.ends_only:
-                            skipped_to_end = True
-                            new_pos = file_size - self.ends_only
-                            if new_pos > current_pos:
-                                f.seek(new_pos)
-                                # Skip partial line
-                                f.readline()
+                    for piece in pieces:
+                        line_num += 1
+                        offset += len(piece)
+                        line = piece.decode('utf-8', errors='ignore')
+                        if line.endswith('\r\n'):
+                            line = line[:-2] + '\n'
+                        elif line.endswith('\r'):
+                            line = line[:-1] + '\n'
+                        
+                        max_lines_scanned += 1
+                        
+                        # Check line limit
+                        if self.max_lines and max_lines_scanned > self.max_lines:
+                            first_error = f"unknown, did not find error in first {self.max_lines} lines"
+                            stop = True
+                            break
+                        
+                        # Handle ends_only (scan only file head and tail)
+                        # Skip for gzipped files as they don't support seeking in text mode
+                        if self.ends_only and not skipped_to_end and not is_gzipped:
+                            if offset > self.ends_only:
+                                skipped_to_end = True
+                                new_pos = file_size - self.ends_only
+                                if new_pos > offset:
+                                    f.seek(new_pos)
+                                    # Skip partial line
+                                    offset = new_pos + len(f.readline())
+                                    break  # Drop this read's remaining pieces
+                        
+                        # Check ignore patterns
+                        if self._should_ignore(line):
+                            continue
+                        
+                        # Auto-detect suite/test from action line
+                        if not suite or not test:
+                            match = line.startswith(_ACTION_PREFIX) and _ACTION_RE.match(line)
+                            if match:
+                                suite = match.group(1)
+                                test = match.group(2)
+                                if not tool:
+                                    current_tool = match.group(3)
                                 continue
-                    
-                    # Check ignore patterns
-                    if self._should_ignore(line):
-                        continue
-                    
-                    # Auto-detect suite/test from action line
-                    if not suite or not test:
-                        match = re.search(r'^# action: gc\(.*\)::(\w+)\/(\w+)\.(\S+)', line)
-                        if match:
-                            suite = match.group(1)
-                            test = match.group(2)
-                            if not tool:
-                                current_tool = match.group(3)
+                        
+                        # Extract tool name from DV output
+                        tool_match = self._extract_tool_from_dv(line)
+                        if tool_match:
+                            current_tool = tool_match
+                            continue
+                        
+                        # Check for "warnings as errors" flag
+                        if _WARNINGS_AS_ERRORS in line:
+                            treat_warnings_as_errors = True
                             continue
-                    
-                    # Extract tool name from DV output
-                    tool_match = self._extract_tool_from_dv(line)
-                    if tool_match:
-                        current_tool = tool_match
-                        continue
-                    
-                    # Check for "warnings as errors" flag
-                    if re.search(r'cc1plus: warnings being treated as errors', line):
-                        treat_warnings_as_errors = True
-                        continue
-                    
-                    # Apply error pattern matching
-                    error_match = self._match_error_patterns(
-                        line,
-                        current_tool or "unknown",
-                        treat_warnings_as_errors
-                    )
-                    
-                    if error_match:
-                        if not first_error_found:
-                            first_error_found = True
-                            first_error = line.strip()
-                            first_error_line = line_num
-                            # Only get offset for non-gzipped files
-                            if not is_gzipped:
-                                first_error_offset = f.tell()
                         
-                        # Update if this is higher severity
-                        if failed_level is None or error_match['level'] > failed_level:
-                            failed_level = error_match['level']
-                            failed_signature = line.strip()
-                            failed_tool = current_tool
-                            failed_line = line
-                            failed_line_no = line_num
-                            # Only get offset for non-gzipped files
-                            if not is_gzipped:
-                                failed_line_offset = f.tell()
-                            failed_pat_pos = error_match['pattern_pos']
+                        # Apply error pattern matching
+                        error_match = self._match_error_patterns(
+                            line,
+                            current_tool or "unknown",
+                            treat_warnings_as_errors
+                        )
+                        
+                        if error_match:
+                            if not first_error_found:
+                                first_error_found = True
+                                first_error = line.strip()
+                                first_error_line = line_num
+                                first_error_offset = offset
+                        
+                            # Update if this is higher severity
+                            if failed_level is None or error_match['level'] > failed_level:
+                                failed_level = error_match['level']
+                                failed_signature = line.strip()
+                                failed_tool = current_tool
+                                failed_line = line
+                                failed_line_no = line_num
+                                failed_line_offset = offset
+                                failed_pat_pos = error_match['pattern_pos']
+                        
+                            # Nothing later can outrank a maximum-severity error
+                            if stop_on_first_error or failed_level >= MAX_ERROR_LEVEL:
+                                stop = True
+                                break
+                    
+                    if stop:
+                        break
             finally:
                 f.close()
         
+        except FileNotFoundError:
+            return self._create_error_signature(
+                suite or "unknown",
+                test or "unknown",
+                "Log file not found",
+                current_tool or "unknown",
+                0, 0, 1, "Log file not found",
+                "error:file_not_found", 0,
+                []
+            )
+        
         except Exception as e:
             return self._create_error_signature(
                 suite or "unknown",
@@ -310,16 +473,12 @@ class LogAnalyzer:
         """
         # Special case: simctrl lines (unless they contain "failed: caught signal <num>")
         # Perl: (/simctrl/  and (not /failed:\s+caught\s+signal\s+\d+/))    and next;
-        if re.search(r'simctrl', line):
-            if not re.search(r'failed:\s+caught\s+signal\s+\d+', line):
-                return True
-        
-        # Check regular ignore patterns
-        for pattern in COMPILED_IGNORE_PATTERNS:
-            if pattern.search(line):
+        if 'simctrl' in line:
+            if not _SIMCTRL_SIGNAL_RE.search(line):
                 return True
         
-        return False
+        # Check regular ignore patterns (one combined search)
+        return COMPILED_IGNORE_UNION.search(line) is not None
     
     def _extract_tool_from_dv(self, line: str) -> Optional[str]:
         """
@@ -331,13 +490,17 @@ class LogAnalyzer:
         Returns:
             Tool name or None
         """
+        # Both forms below contain this literal; most lines don't
+        if 'dv: ' not in line:
+            return None
+        
         # dv: ... running tool <tool_name>
-        match = re.search(r'dv: \.\.\. running tool (\S+)', line)
+        match = _DV_RUNNING_TOOL_RE.search(line)
         if match:
             return match.group(1)
         
         # dv: tool <tool_name> failed!
-        match = re.search(r'dv: tool (\S+) failed!', line)
+        match = _DV_TOOL_FAILED_RE.search(line)
         if match:
             return match.group(1)
         
@@ -364,14 +527,15 @@ class LogAnalyzer:
         if not line.strip():
             return None
         
-        # Check error patterns
-        for pattern_dict in ERROR_PATTERNS:
-            pattern = pattern_dict['pattern']
-            if pattern.search(line):
-                return {
-                    'level': pattern_dict['level'],
-                    'pattern_pos': pattern_dict['pos']
-                }
+        # Check error patterns (the ordered loop only runs for prefilter hits)
+        if ERROR_PREFILTER.search(line):
+            for pattern_dict in ERROR_PATTERNS:
+                pattern = pattern_dict['pattern']
+                if pattern.search(line):
+                    return {
+                        'level': pattern_dict['level'],
+                        'pattern_pos': pattern_dict['pos']
+                    }
         
         # Check warning patterns if warnings are errors
         if treat_warnings_as_errors:
@@ -390,7 +554,8 @@ class LogAnalyzer:
         log_content: str,
         suite: Optional[str] = None,
         test: Optional[str] = None,
-        tool: Optional[str] = None
+        tool: Optional[str] = None,
+        stop_on_first_error: bool = False
     ) -> ErrorSignature:
         """
         Analyze log content directly (without file path).
@@ -400,6 +565,8 @@ class LogAnalyzer:
             suite: Test suite name
             test: Test name
             tool: Tool name
+            stop_on_first_error: Stop scanning at the first error instead of
+                looking further for a higher-severity one
             
         Returns:
             ErrorSignature object
@@ -423,11 +590,6 @@ class LogAnalyzer:
         max_lines_scanned = 0
         
         for line_num, line in enumerate(lines, 1):
-            # Update history
-            self.history.insert(0, line)
-            if len(self.history) > self.history_size:
-                self.history.pop()
-            
             max_lines_scanned += 1
             
             # Check line limit
@@ -441,7 +603,7 @@ class LogAnalyzer:
             
             # Auto-detect suite/test
             if not suite or not test:
-                match = re.search(r'^# action: gc\(.*\)::(\w+)\/(\w+)\.(\S+)', line)
+                match = line.startswith(_ACTION_PREFIX) and _ACTION_RE.match(line)
                 if match:
                     suite = match.group(1)
                     test = match.group(2)
@@ -456,7 +618,7 @@ class LogAnalyzer:
                 continue
             
             # Check for warnings as errors
-            if re.search(r'cc1plus: warnings being treated as errors', line):
+            if _WARNINGS_AS_ERRORS in line:
                 treat_warnings_as_errors = True
                 continue
             
@@ -481,6 +643,10 @@ class LogAnalyzer:
                     failed_line = line
                     failed_line_no = line_num
                     failed_pat_pos = error_match['pattern_pos']
+                
+                # Nothing later can outrank a maximum-severity error
+                if stop_on_first_error or failed_level >= MAX_ERROR_LEVEL:
+                    break
         
         # Set defaults if no error found
         if not first_error_found:
@@ -528,15 +694,8 @@ class LogAnalyzer:
         """
         errors = []
         
-        if not os.path.exists(log_file_path):
-            return errors
-        
         try:
-            # Handle gzipped files
-            if log_file_path.endswith('.gz'):
-                f = gzip.open(log_file_path, 'rt', encoding='utf-8', errors='ignore')
-            else:
-                f = open(log_file_path, 'r', encoding='utf-8', errors='ignore')
+            f = _open_log_text(log_file_path)
             
             try:
                 treat_warnings_as_errors = False
@@ -547,7 +706,7 @@ class LogAnalyzer:
                         continue
                     
                     # Check for warnings as errors
-                    if re.search(r'cc1plus: warnings being treated as errors', line):
+                    if _WARNINGS_AS_ERRORS in line:
                         treat_warnings_as_errors = True
                         continue
                     
@@ -586,19 +745,15 @@ class LogAnalyzer:
         Returns:
             Last N lines as a single string
         """
-        if not os.path.exists(log_file_path):
-            return "Log file not found"
-        
         try:
-            # Handle gzipped files
-            if log_file_path.endswith('.gz'):
-                with gzip.open(log_file_path, 'rt', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-            else:
-                with open(log_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
+            if num_lines > 0 and not log_file_path.endswith('.gz'):
+                return _read_tail(log_file_path, num_lines)
+            with _open_log_text(log_file_path) as f:
+                lines = f.readlines()
             tail_lines = lines[-num_lines:] if len(lines) > num_lines else lines
             return ''.join(tail_lines)
+        except FileNotFoundError:
+            return "Log file not found"
         except Exception as e:
             return f"Error reading log file: {str(e)}"
     
@@ -619,32 +774,31 @@ class LogAnalyzer:
         Returns:
             Context as a string
         """
-        if not os.path.exists(log_file_path):
-            return "Log file not found"
-        
         try:
-            # Handle gzipped files
-            if log_file_path.endswith('.gz'):
-                with gzip.open(log_file_path, 'rt', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-            else:
-                with open(log_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                
-                start = max(0, error_line_number - context_lines - 1)
-                end = min(len(lines), error_line_number + context_lines)
-                
-                context_lines_list = []
-                for i in range(start, end):
-                    line_num = i + 1
-                    marker = ">>> " if line_num == error_line_number else "    "
-                    context_lines_list.append(f"{marker}{line_num:5d}: {lines[i].rstrip()}")
-                
-                return '\n'.join(context_lines_list)
+            with _open_log_text(log_file_path) as f:
+                lines = f.readlines()
+            
+            start = max(0, error_line_number - context_lines - 1)
+            end = min(len(lines), error_line_number + context_lines)
+            
+            context_lines_list = []
+            for i in range(start, end):
+                line_num = i + 1
+                marker = ">>> " if line_num == error_line_number else "    "
+                context_lines_list.append(f"{marker}{line_num:5d}: {lines[i].rstrip()}")
+            
+            return '\n'.join(context_lines_list)
+        except FileNotFoundError:
+            return "Log file not found"
         except Exception as e:
             return f"Error reading context: {str(e)}"
 
 
+# Shared analyzer for module-level helpers. LogAnalyzer keeps only
+# configuration on the instance, so one instance can serve every call.
+_DEFAULT_ANALYZER = LogAnalyzer(max_lines=None)  # No limit, scan entire file
+
+
 def quick_error_check(log_file_path: str) -> bool:
     """
     Quick check if log file contains errors.
@@ -655,28 +809,7 @@ def quick_error_check(log_file_path: str) -> bool:
     Returns:
         True if errors found, False otherwise
     """
-    if not os.path.exists(log_file_path):
-        return False
-    
-    analyzer = LogAnalyzer(max_lines=None)  # No limit, scan entire file
-    try:
-        # Handle gzipped files
-        if log_file_path.endswith('.gz'):
-            f = gzip.open(log_file_path, 'rt', encoding='utf-8', errors='ignore')
-        else:
-            f = open(log_file_path, 'r', encoding='utf-8', errors='ignore')
-        
-        try:
-            for line in f:
-                if analyzer._should_ignore(line):
-                    continue
-                    
-                error_match = analyzer._match_error_patterns(line, "unknown", False)
-                if error_match:
-                    return True
-        finally:
-            f.close()
-    except Exception:
-        pass
-    
-    return False
+    result = _DEFAULT_ANALYZER.analyze_failure(log_file_path, stop_on_first_error=True)
+    # 'unknown' means no error line matched; 'error:*' means the log could
+    # not be read
+    return result.pattern_pos != 'unknown' and not result.pattern_pos.startswith('error:')
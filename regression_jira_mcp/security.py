@@ -7,6 +7,7 @@ Only raises exceptions when write operations are attempted.
 
 import re
 import logging
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +33,26 @@ class QueryValidator:
         'EXECUTE', 'CALL'
     ]
     
+    # Patterns for other write/file operations
+    DANGEROUS_PATTERNS = [
+        r'\bINTO\s+OUTFILE\b',  # File write
+        r'\bLOAD\s+DATA\b',     # Data import
+        r'\bCOPY\b.*\bFROM\b',  # PostgreSQL COPY
+    ]
+    
+    # Each list compiled into one case-insensitive alternation, so a query
+    # is scanned once per list, as-is, instead of once per entry
+    _WRITE_RE = re.compile(r'\b(' + '|'.join(WRITE_KEYWORDS) + r')\b', re.IGNORECASE)
+    
+    # DANGEROUS_PATTERNS split into two tiers: a cheap first pass where COPY
+    # is a bare keyword, and a FROM lookup run only after a COPY hit. This
+    # avoids the COPY...FROM '.*' scan on ordinary queries.
+    _DANGER_FAST_RE = re.compile(
+        r'\bINTO\s+OUTFILE\b|\bLOAD\s+DATA\b|\b(COPY)\b',
+        re.IGNORECASE
+    )
+    _FROM_RE = re.compile(r'\bFROM\b', re.IGNORECASE)
+    
     @staticmethod
     def validate(query: str) -> None:
         """
@@ -49,34 +70,53 @@ class QueryValidator:
         if not query:
             return
         
-        query_upper = query.upper().strip()
-        
-        # Check for write keywords
-        for keyword in QueryValidator.WRITE_KEYWORDS:
-            # Use word boundary regex to avoid false positives
-            pattern = r'\b' + keyword + r'\b'
-            if re.search(pattern, query_upper):
-                logger.warning(f"Blocked write operation attempt: {keyword}")
-                raise SecurityError(
-                    f"Database modification not permitted. "
-                    f"This MCP server is configured for read-only access. "
-                    f"Attempted operation: {keyword}"
-                )
+        # Check for write keywords (word boundaries avoid false positives)
+        match = QueryValidator._WRITE_RE.search(query)
+        if match:
+            keyword = match.group(1).upper()
+            logger.warning("Blocked write operation attempt: %s", keyword)
+            raise SecurityError(
+                f"Database modification not permitted. "
+                f"This MCP server is configured for read-only access. "
+                f"Attempted operation: {keyword}"
+            )
         
         # Additional check for dangerous patterns
-        dangerous_patterns = [
-            r'\bINTO\s+OUTFILE\b',  # File write
-            r'\bLOAD\s+DATA\b',     # Data import
-            r'\bCOPY\b.*\bFROM\b',  # PostgreSQL COPY
-        ]
-        
-        for pattern in dangerous_patterns:
-            if re.search(pattern, query_upper):
-                logger.warning(f"Blocked dangerous operation: {pattern}")
-                raise SecurityError(
-                    f"Database modification not permitted. "
-                    f"This MCP server is configured for read-only access."
-                )
+        if QueryValidator._is_dangerous(query):
+            pattern = next(
+                p for p in QueryValidator.DANGEROUS_PATTERNS
+                if re.search(p, query, re.IGNORECASE)
+            )
+            logger.warning("Blocked dangerous operation: %s", pattern)
+            raise SecurityError(
+                f"Database modification not permitted. "
+                f"This MCP server is configured for read-only access."
+            )
+    
+    @staticmethod
+    def _is_dangerous(query: str) -> bool:
+        """
+        Check query against DANGEROUS_PATTERNS.
+        
+        Args:
+            query: SQL query to check
+            
+        Returns:
+            True if any dangerous pattern matches
+        """
+        for match in QueryValidator._DANGER_FAST_RE.finditer(query):
+            if match.group(1) is None:
+                return True  # INTO OUTFILE / LOAD DATA
+            
+            # COPY only counts with FROM later on the same line ('.' in the
+            # original pattern does not cross newlines)
+            line_end = query.find('\n', match.end())
+            if line_end == -1:
+                line_end = len(query)
+            if QueryValidator._FROM_RE.search(query, match.end(), line_end):
+                return True
+        
+        return False
 
 
 def validate_query(query: str) -> None:
@@ -103,7 +143,7 @@ class JiraOperationValidator:
     # ========== Whitelist: Allowed Read-Only Operations ==========
     # These are method names from the JIRA Python library, not our wrapper methods
     
-    ALLOWED_OPERATIONS = {
+    ALLOWED_OPERATIONS = frozenset({
         # === Currently used core methods ===
         'search_issues',      # ✓ Search JIRA issues
         'issue',              # ✓ Get single issue details  
@@ -133,11 +173,11 @@ class JiraOperationValidator:
         'projects',           # Get all projects
         'user',               # Get user info
         'transitions',        # Get available transitions (read-only metadata)
-    }
+    })
     
     # ========== Blacklist: Explicitly Forbidden Modification Operations ==========
     
-    FORBIDDEN_OPERATIONS = {
+    FORBIDDEN_OPERATIONS = frozenset({
         # === Issue CRUD operations ===
         'create_issue', 'create_issues',
         'update_issue', 'update_issue_field',
@@ -178,7 +218,7 @@ class JiraOperationValidator:
         'create_version',
         'update_version',
         'delete_version',
-    }
+    })
     
     @staticmethod
     def validate(operation_name: str) -> None:
@@ -198,7 +238,7 @@ class JiraOperationValidator:
         """
         # Check blacklist first - explicitly forbidden operations
         if operation_name in JiraOperationValidator.FORBIDDEN_OPERATIONS:
-            logger.warning(f"Blocked JIRA modification attempt: {operation_name}")
+            logger.warning("Blocked JIRA modification attempt: %s", operation_name)
             raise SecurityError(
                 f"JIRA modification not permitted. "
                 f"This MCP server is configured for read-only access. "
@@ -207,17 +247,22 @@ class JiraOperationValidator:
         
         # Check whitelist - only allowed operations can proceed
         if operation_name not in JiraOperationValidator.ALLOWED_OPERATIONS:
-            logger.warning(f"Blocked unknown JIRA operation: {operation_name}")
+            logger.warning("Blocked unknown JIRA operation: %s", operation_name)
             raise SecurityError(
                 f"JIRA operation '{operation_name}' is not in the allowed operations list. "
                 f"This MCP server only allows read-only JIRA access."
             )
 
 
+@lru_cache(maxsize=256)
 def validate_jira_operation(operation_name: str) -> None:
     """
     Convenience function for JIRA operation validation.
     
+    Called on every attribute access through ReadOnlyJiraProxy, so results
+    are memoized. Only successful validations are cached; rejected names
+    raise (and are logged) every time.
+    
     Args:
         operation_name: JIRA method name to validate
         
@@ -8,24 +8,107 @@ Provides unified PostgreSQL and JIRA tools for regression test analysis.
 import os
 import json
 import sys
-from typing import Optional
+import threading
+import asyncio
+import functools
+import itertools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from mcp.server import Server
 from mcp.types import Tool, TextContent
 from dotenv import load_dotenv
+from cachetools import LRUCache, TTLCache
 
-from .db_queries import RegressionDB
+from .db_queries import POOL_MAX_CONNECTIONS, RegressionDB
 from .jira_client import JiraClient
-from .log_analyzer import LogAnalyzer
+from .log_analyzer import LogAnalyzer, ErrorSignature
 from .error_matcher import ErrorMatcher
 from .utils import extract_keywords_from_test_name
 from .security import SecurityError
 
-# Load environment variables
-load_dotenv()
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
 
 # Initialize server
 app = Server("regression-jira-mcp")
 
+# Worker threads for blocking calls. Sized to the database pool: each
+# RegressionDB call holds at most one pooled connection at a time, so the
+# workers cannot exhaust it (psycopg2 raises instead of waiting).
+_IO_POOL = ThreadPoolExecutor(
+    max_workers=POOL_MAX_CONNECTIONS,
+    thread_name_prefix='regression-io'
+)
+
+# Number of tests a multi-test tool processes at the same time by default,
+# and the most a caller may ask for (more could not run in parallel anyway)
+BATCH_CONCURRENCY = 8
+MAX_BATCH_CONCURRENCY = POOL_MAX_CONNECTIONS
+
+# JIRA candidates fetched per test for batch_find_solutions' shared search
+BATCH_JIRA_RESULTS_PER_TEST = 10
+
+# Bounds on that search: keywords per JQL query (keeps the query short),
+# queries per batch, and results per query (JIRA caps a page at 100)
+BATCH_JQL_MAX_KEYWORDS = 25
+BATCH_JQL_MAX_SEARCHES = 4
+BATCH_JIRA_MAX_RESULTS = 100
+
+# Issue fields that error matching reads; solution searches fetch only these
+MATCH_FIELDS = ('summary', 'status', 'description', 'resolution', 'labels')
+
+# JIRA responses cached for the session: the same known issues and
+# searches come up again and again across tests
+jira_issue_cache = TTLCache(maxsize=1024, ttl=300)
+jira_search_cache = TTLCache(maxsize=256, ttl=60)
+
+# Log analyses keyed by (path, mtime_ns, size, block, test, scan_mode).
+# Filled from worker threads, so access goes through the lock.
+log_analysis_cache = LRUCache(maxsize=512)
+_log_analysis_lock = threading.Lock()
+
+# Responses are indented for readability unless MCP_JSON_COMPACT is set
+# (read in initialize()) or a top-level list has more items than this
+json_compact = False
+COMPACT_JSON_MIN_ITEMS = 20
+
+# Shared encoders for tool responses (json.dumps would build one per call);
+# orjson is used instead when installed, it is much faster on large payloads.
+# Both fall back to str() for anything JSON has no type for (datetimes,
+# dataclasses, ...), so the output is the same whichever is used.
+_JSON_ENCODERS = {
+    False: json.JSONEncoder(indent=2, ensure_ascii=False, default=str).encode,
+    True: json.JSONEncoder(separators=(',', ':'), ensure_ascii=False, default=str).encode,
+}
+
+
+def _encode_json_stdlib(obj, compact: bool = False) -> str:
+    return _JSON_ENCODERS[compact](obj)
+
+
+if ORJSON_AVAILABLE:
+    _ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+    
+    def _encode_json_orjson(obj, compact: bool = False) -> str:
+        option = _ORJSON_OPTIONS
+        if not compact:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=str, option=option).decode('utf-8')
+    
+    _encode_json = _encode_json_orjson
+else:
+    _encode_json = _encode_json_stdlib
+
 # Global instances
 db: Optional[RegressionDB] = None
 jira: Optional[JiraClient] = None
@@ -35,7 +118,13 @@ error_matcher: Optional[ErrorMatcher] = None
 
 def initialize():
     """Initialize all clients"""
-    global db, jira, log_analyzer, error_matcher
+    global db, jira, log_analyzer, error_matcher, json_compact
+    
+    # Load environment variables (only needed by the clients created here,
+    # so importing this module does no file I/O)
+    load_dotenv()
+    
+    json_compact = os.getenv('MCP_JSON_COMPACT', '').lower() in ('1', 'true', 'yes')
     
     try:
         db = RegressionDB()
@@ -50,224 +139,477 @@ def initialize():
         raise
 
 
+async def _run_blocking(func, *args, **kwargs):
+    """
+    Run a blocking call (database, JIRA, log file I/O) in a worker thread.
+    
+    Tool handlers are coroutines on the MCP event loop; calling the sync
+    clients directly would stall every other request until they return.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_IO_POOL, functools.partial(func, *args, **kwargs))
+
+
+def _stat_log(log_path: Optional[str]) -> Optional[os.stat_result]:
+    """
+    Stat a log file.
+    
+    The result doubles as the existence check and as the analysis cache
+    key, so a log is stat()ed once per tool call.
+    
+    Args:
+        log_path: Path to the log file (may be None)
+        
+    Returns:
+        os.stat_result, or None if there is no path or the file is missing
+    """
+    if not log_path:
+        return None
+    try:
+        return os.stat(log_path)
+    except OSError:
+        return None
+
+
+def _batch_stat(paths: List[str]) -> Dict[str, Optional[os.stat_result]]:
+    """
+    Stat many log files, listing each directory only once.
+    
+    Directories holding several of the paths are read with one scandir(),
+    so missing files cost no stat() of their own, which matters on
+    NFS-mounted logs.
+    
+    Args:
+        paths: File paths to check
+        
+    Returns:
+        Dict mapping each path to its os.stat_result, or None if missing
+    """
+    by_dir: Dict[str, List[str]] = {}
+    for path in paths:
+        by_dir.setdefault(os.path.dirname(path), []).append(path)
+    
+    result = {}
+    for directory, dir_paths in by_dir.items():
+        if len(dir_paths) == 1:
+            result[dir_paths[0]] = _stat_log(dir_paths[0])
+            continue
+        try:
+            with os.scandir(directory or '.') as entries:
+                found = {entry.name: entry for entry in entries}
+        except OSError:
+            # Unlistable directory (e.g. execute-only): fall back to stat
+            for path in dir_paths:
+                result[path] = _stat_log(path)
+            continue
+        for path in dir_paths:
+            entry = found.get(os.path.basename(path))
+            try:
+                result[path] = entry.stat() if entry is not None else None
+            except OSError:
+                # e.g. a dangling symlink
+                result[path] = None
+    
+    return result
+
+
+def _resolve_log(test_info: dict) -> Tuple[Optional[str], Optional[os.stat_result]]:
+    """
+    Look up a test's log file on its own and stat it.
+    
+    Args:
+        test_info: Test record from the database
+        
+    Returns:
+        Tuple of (log_path, log_stat); log_stat is None if the log is missing
+    """
+    log_path = db.get_log_file_path(
+        test_info['test_object_run_id'],
+        test_info['regression_run_id']
+    )
+    return log_path, _stat_log(log_path)
+
+
+def _load_test_with_log(
+    test_name: str,
+    regression_run_id: Optional[int]
+) -> Tuple[Optional[dict], Optional[Tuple[Optional[str], Optional[os.stat_result]]]]:
+    """
+    Look up a test and its log file in one query, then stat the log.
+    
+    If the combined query fails (e.g. the run's job table is missing), the
+    test is looked up on its own and the log is left unresolved, so callers
+    can resolve it with _resolve_log and handle that failure themselves.
+    
+    Args:
+        test_name: Test name
+        regression_run_id: Regression run ID (None = most recent run)
+        
+    Returns:
+        Tuple of (test_info, log_lookup); test_info is None if the test is
+        not found, log_lookup is (log_path, log_stat) or None if unresolved,
+        and log_stat is None if the log is missing
+    """
+    try:
+        test_info = db.get_test_by_name(
+            test_name,
+            regression_run_id=regression_run_id,
+            include_log_path=True
+        )
+    except Exception as e:
+        logger.warning("Combined test/log lookup failed for %s: %s", test_name, e)
+        return db.get_test_by_name(test_name, regression_run_id=regression_run_id), None
+    
+    if not test_info:
+        return None, None
+    
+    log_path = test_info.pop('log_file_path')
+    return test_info, (log_path, _stat_log(log_path))
+
+
+def _analyze_log(
+    log_path: str,
+    block_name: Optional[str],
+    test_name: Optional[str],
+    scan_mode: str = 'full',
+    st: Optional[os.stat_result] = None
+) -> ErrorSignature:
+    """
+    Analyze a log file, reusing the previous result if it hasn't changed.
+    
+    The cache key includes the file's mtime and size, so a rewritten log
+    is analyzed again.
+    
+    Args:
+        log_path: Path to the log file
+        block_name: Test suite/block name
+        test_name: Test name
+        scan_mode: 'full' or 'tail_first' (see LogAnalyzer.analyze_failure)
+        st: The log's os.stat_result if the caller already has it
+        
+    Returns:
+        ErrorSignature (shared; do not modify)
+    """
+    if st is None:
+        st = os.stat(log_path)
+    key = (log_path, st.st_mtime_ns, st.st_size, block_name, test_name, scan_mode)
+    with _log_analysis_lock:
+        error_sig = log_analysis_cache.get(key)
+    if error_sig is not None:
+        return error_sig
+    
+    error_sig = log_analyzer.analyze_failure(
+        log_path, block_name, test_name, scan_mode=scan_mode
+    )
+    # Read failures (error:read_failure etc.) may be transient, e.g. EACCES
+    # or an NFS hiccup, so only successful analyses are kept
+    if not error_sig.pattern_pos.startswith('error:'):
+        with _log_analysis_lock:
+            log_analysis_cache[key] = error_sig
+    return error_sig
+
+
+def _search_keywords(keywords: List[str]) -> List[str]:
+    """
+    Canonicalize keywords for a JIRA text search.
+    
+    JIRA text search is case-insensitive, so lowercasing, deduplicating and
+    sorting gives equivalent keyword sets the same JQL (and cache entry).
+    
+    Args:
+        keywords: Search keywords
+        
+    Returns:
+        Sorted list of unique lowercase keywords
+    """
+    return sorted({kw.lower() for kw in keywords})
+
+
+async def _cached_search(
+    jql: str,
+    max_results: int,
+    fields: Optional[Tuple[str, ...]] = None
+) -> List[dict]:
+    """
+    Search JIRA, reusing a recent result for the same query.
+    
+    Args:
+        jql: JQL query string
+        max_results: Maximum results to return
+        fields: Fields to retrieve (None = JiraClient defaults)
+        
+    Returns:
+        List of issue dictionaries (shared; do not modify)
+    """
+    key = (jql, max_results, fields)
+    issues = jira_search_cache.get(key)
+    if issues is None:
+        issues = await _run_blocking(
+            jira.search_issues,
+            jql,
+            max_results=max_results,
+            fields=list(fields) if fields else None
+        )
+        jira_search_cache[key] = issues
+    return issues
+
+
+async def _cached_get_issue(issue_key: str, include_comments: bool) -> Optional[dict]:
+    """
+    Fetch a JIRA issue, reusing a recent result for the same key.
+    
+    Missing issues are not cached, so a transient lookup failure is
+    retried on the next call.
+    
+    Args:
+        issue_key: JIRA issue key
+        include_comments: Whether to include comments
+        
+    Returns:
+        Issue dictionary (shared; do not modify) or None if not found
+    """
+    key = (issue_key, include_comments)
+    issue = jira_issue_cache.get(key)
+    if issue is None:
+        issue = await _run_blocking(jira.get_issue, issue_key, include_comments=include_comments)
+        if issue is not None:
+            jira_issue_cache[key] = issue
+    return issue
+
+
 # ============================================================================
 # PostgreSQL Tools
 # ============================================================================
 
-@app.list_tools()
-async def list_tools() -> list[Tool]:
-    """List all available tools"""
-    return [
-        Tool(
-            name="query_failed_tests",
-            description="Query failed tests from PostgreSQL database",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "regression_run_id": {
-                        "type": "integer",
-                        "description": "Regression run ID (optional if project/regression names provided)"
-                    },
-                    "project_name": {
-                        "type": "string",
-                        "description": "Project name (optional)"
-                    },
-                    "regression_name": {
-                        "type": "string",
-                        "description": "Regression name (optional)"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of results (optional, omit for no limit)"
-                    },
-                    "include_logs": {
-                        "type": "boolean",
-                        "description": "Whether to analyze log files (default: true)",
-                        "default": True
-                    }
+# Tool definitions are static, so they are built once at import
+TOOLS = [
+    Tool(
+        name="query_failed_tests",
+        description="Query failed tests from PostgreSQL database",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "regression_run_id": {
+                    "type": "integer",
+                    "description": "Regression run ID (optional if project/regression names provided)"
+                },
+                "project_name": {
+                    "type": "string",
+                    "description": "Project name (optional)"
+                },
+                "regression_name": {
+                    "type": "string",
+                    "description": "Regression name (optional)"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of results (optional, omit for no limit)"
+                },
+                "include_logs": {
+                    "type": "boolean",
+                    "description": "Whether to analyze log files (default: true)",
+                    "default": True
                 }
             }
-        ),
-        Tool(
-            name="get_test_details",
-            description="Get detailed information for a specific test",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "test_name": {
-                        "type": "string",
-                        "description": "Test name"
-                    },
-                    "regression_run_id": {
-                        "type": "integer",
-                        "description": "Regression run ID (optional)"
-                    },
-                    "analyze_logs": {
-                        "type": "boolean",
-                        "description": "Whether to analyze log files (default: true)",
-                        "default": True
-                    }
+        }
+    ),
+    Tool(
+        name="get_test_details",
+        description="Get detailed information for a specific test",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "test_name": {
+                    "type": "string",
+                    "description": "Test name"
                 },
-                "required": ["test_name"]
-            }
-        ),
-        Tool(
-            name="get_regression_summary",
-            description="Get summary statistics for a regression run",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "regression_run_id": {
-                        "type": "integer",
-                        "description": "Regression run ID"
-                    }
+                "regression_run_id": {
+                    "type": "integer",
+                    "description": "Regression run ID (optional)"
                 },
-                "required": ["regression_run_id"]
-            }
-        ),
-        Tool(
-            name="analyze_test_log",
-            description="Analyze test log file to extract error information",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "test_name": {
-                        "type": "string",
-                        "description": "Test name"
-                    },
-                    "regression_run_id": {
-                        "type": "integer",
-                        "description": "Regression run ID"
-                    }
+                "analyze_logs": {
+                    "type": "boolean",
+                    "description": "Whether to analyze log files (default: true)",
+                    "default": True
+                }
+            },
+            "required": ["test_name"]
+        }
+    ),
+    Tool(
+        name="get_regression_summary",
+        description="Get summary statistics for a regression run",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "regression_run_id": {
+                    "type": "integer",
+                    "description": "Regression run ID"
+                }
+            },
+            "required": ["regression_run_id"]
+        }
+    ),
+    Tool(
+        name="analyze_test_log",
+        description="Analyze test log file to extract error information",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "test_name": {
+                    "type": "string",
+                    "description": "Test name"
                 },
-                "required": ["test_name", "regression_run_id"]
-            }
-        ),
-        Tool(
-            name="search_jira_issues",
-            description="Search JIRA issues using JQL query",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "jql": {
-                        "type": "string",
-                        "description": "JQL query string"
-                    },
-                    "max_results": {
-                        "type": "integer",
-                        "description": "Maximum results (default: 50)",
-                        "default": 50
-                    }
+                "regression_run_id": {
+                    "type": "integer",
+                    "description": "Regression run ID"
                 },
-                "required": ["jql"]
-            }
-        ),
-        Tool(
-            name="search_jira_by_text",
-            description="Simple text search in JIRA",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "search_text": {
-                        "type": "string",
-                        "description": "Text to search for"
-                    },
-                    "status_filter": {
-                        "type": "string",
-                        "description": "Filter by status (e.g., 'Resolved', 'Closed')"
-                    },
-                    "project_filter": {
-                        "type": "string",
-                        "description": "Filter by project key"
-                    },
-                    "max_results": {
-                        "type": "integer",
-                        "description": "Maximum results (default: 20)",
-                        "default": 20
-                    }
+                "scan_mode": {
+                    "type": "string",
+                    "enum": ["full", "tail_first"],
+                    "description": "'tail_first' checks the end of the log first and stops there on a fatal error (faster on large logs)",
+                    "default": "full"
+                }
+            },
+            "required": ["test_name", "regression_run_id"]
+        }
+    ),
+    Tool(
+        name="search_jira_issues",
+        description="Search JIRA issues using JQL query",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "jql": {
+                    "type": "string",
+                    "description": "JQL query string"
                 },
-                "required": ["search_text"]
-            }
-        ),
-        Tool(
-            name="get_jira_issue",
-            description="Get detailed information for a specific JIRA issue",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "issue_key": {
-                        "type": "string",
-                        "description": "JIRA issue key (e.g., 'PROJ-1234')"
-                    },
-                    "include_comments": {
-                        "type": "boolean",
-                        "description": "Include comments (default: true)",
-                        "default": True
-                    }
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum results (default: 50)",
+                    "default": 50
+                }
+            },
+            "required": ["jql"]
+        }
+    ),
+    Tool(
+        name="search_jira_by_text",
+        description="Simple text search in JIRA",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "search_text": {
+                    "type": "string",
+                    "description": "Text to search for"
                 },
-                "required": ["issue_key"]
-            }
-        ),
-        Tool(
-            name="find_solutions_for_test",
-            description="🌟 One-click solution finder: Find JIRA solutions for a failed test",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "test_name": {
-                        "type": "string",
-                        "description": "Test name"
-                    },
-                    "regression_run_id": {
-                        "type": "integer",
-                        "description": "Regression run ID (optional)"
-                    },
-                    "max_jira_results": {
-                        "type": "integer",
-                        "description": "Maximum JIRA results (default: 10)",
-                        "default": 10
-                    }
+                "status_filter": {
+                    "type": "string",
+                    "description": "Filter by status (e.g., 'Resolved', 'Closed')"
                 },
-                "required": ["test_name"]
-            }
-        ),
-        Tool(
-            name="batch_find_solutions",
-            description="Batch find JIRA solutions for multiple failed tests",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "regression_run_id": {
-                        "type": "integer",
-                        "description": "Regression run ID"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Number of failed tests to process (default: 10)",
-                        "default": 10
-                    }
+                "project_filter": {
+                    "type": "string",
+                    "description": "Filter by project key"
                 },
-                "required": ["regression_run_id"]
-            }
-        ),
-        Tool(
-            name="list_regression_runs",
-            description="List recent regression runs",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project_name": {
-                        "type": "string",
-                        "description": "Filter by project name (optional)"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum results (optional, omit for no limit)"
-                    }
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum results (default: 20)",
+                    "default": 20
+                }
+            },
+            "required": ["search_text"]
+        }
+    ),
+    Tool(
+        name="get_jira_issue",
+        description="Get detailed information for a specific JIRA issue",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "issue_key": {
+                    "type": "string",
+                    "description": "JIRA issue key (e.g., 'PROJ-1234')"
+                },
+                "include_comments": {
+                    "type": "boolean",
+                    "description": "Include comments (default: true)",
+                    "default": True
+                }
+            },
+            "required": ["issue_key"]
+        }
+    ),
+    Tool(
+        name="find_solutions_for_test",
+        description="🌟 One-click solution finder: Find JIRA solutions for a failed test",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "test_name": {
+                    "type": "string",
+                    "description": "Test name"
+                },
+                "regression_run_id": {
+                    "type": "integer",
+                    "description": "Regression run ID (optional)"
+                },
+                "max_jira_results": {
+                    "type": "integer",
+                    "description": "Maximum JIRA results (default: 10)",
+                    "default": 10
+                }
+            },
+            "required": ["test_name"]
+        }
+    ),
+    Tool(
+        name="batch_find_solutions",
+        description="Batch find JIRA solutions for multiple failed tests",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "regression_run_id": {
+                    "type": "integer",
+                    "description": "Regression run ID"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Number of failed tests to process (default: 10)",
+                    "default": 10
+                },
+                "concurrency": {
+                    "type": "integer",
+                    "description": f"Tests processed in parallel (default: {BATCH_CONCURRENCY}, max: {MAX_BATCH_CONCURRENCY})",
+                    "default": BATCH_CONCURRENCY
+                }
+            },
+            "required": ["regression_run_id"]
+        }
+    ),
+    Tool(
+        name="list_regression_runs",
+        description="List recent regression runs",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project_name": {
+                    "type": "string",
+                    "description": "Filter by project name (optional)"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum results (optional, omit for no limit)"
                 }
             }
-        )
-    ]
+        }
+    )
+]
+
+
+@app.list_tools()
+async def list_tools() -> list[Tool]:
+    """List all available tools"""
+    return list(TOOLS)  # Copy so callers can't alter the shared list
 
 
 @app.call_tool()
@@ -275,30 +617,16 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """Handle tool calls"""
     
     try:
-        if name == "query_failed_tests":
-            result = await query_failed_tests_tool(arguments)
-        elif name == "get_test_details":
-            result = await get_test_details_tool(arguments)
-        elif name == "get_regression_summary":
-            result = await get_regression_summary_tool(arguments)
-        elif name == "analyze_test_log":
-            result = await analyze_test_log_tool(arguments)
-        elif name == "search_jira_issues":
-            result = await search_jira_issues_tool(arguments)
-        elif name == "search_jira_by_text":
-            result = await search_jira_by_text_tool(arguments)
-        elif name == "get_jira_issue":
-            result = await get_jira_issue_tool(arguments)
-        elif name == "find_solutions_for_test":
-            result = await find_solutions_for_test_tool(arguments)
-        elif name == "batch_find_solutions":
-            result = await batch_find_solutions_tool(arguments)
-        elif name == "list_regression_runs":
-            result = await list_regression_runs_tool(arguments)
-        else:
+        handler = TOOL_HANDLERS.get(name)
+        if handler is None:
             raise ValueError(f"Unknown tool: {name}")
+        result = await handler(arguments)
         
-        return [TextContent(type="text", text=json.dumps(result, indent=2, ensure_ascii=False))]
+        compact = json_compact or any(
+            isinstance(value, list) and len(value) > COMPACT_JSON_MIN_ITEMS
+            for value in result.values()
+        )
+        return [TextContent(type="text", text=_encode_json(result, compact))]
     
     except SecurityError as e:
         # Handle security violations with clear message
@@ -308,11 +636,11 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
             "tool": name,
             "note": "This MCP server has read-only access to the database."
         }
-        return [TextContent(type="text", text=json.dumps(error_result, indent=2))]
+        return [TextContent(type="text", text=_encode_json(error_result))]
     
     except Exception as e:
         error_result = {"error": str(e), "tool": name}
-        return [TextContent(type="text", text=json.dumps(error_result, indent=2))]
+        return [TextContent(type="text", text=_encode_json(error_result))]
 
 
 # ============================================================================
@@ -327,36 +655,51 @@ async def query_failed_tests_tool(args: dict) -> dict:
     limit = args.get('limit', 10)
     include_logs = args.get('include_logs', True)
     
-    tests = db.query_failed_tests(
+    tests = await _run_blocking(
+        db.query_failed_tests,
         regression_run_id=regression_run_id,
         project_name=project_name,
         regression_name=regression_name,
         limit=limit
     )
     
-    # Optionally analyze logs
+    # Optionally analyze logs (concurrently, bounded; each scan runs in a
+    # worker thread)
     if include_logs and tests:
-        for test in tests:
-            try:
-                log_path = db.get_log_file_path(
-                    test['test_object_run_id'],
-                    test.get('regression_run_id', regression_run_id)
-                )
-                if log_path and os.path.exists(log_path):
-                    error_sig = log_analyzer.analyze_failure(
-                        log_path,
-                        test.get('block_name'),
-                        test['test_name']
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+        
+        async def analyze(test: dict):
+            # Without a failed job there is no log to find; skip the lookup
+            if not test.get('failed_job_run_ref'):
+                return
+            
+            async with semaphore:
+                try:
+                    log_path = await _run_blocking(
+                        db.get_log_file_path,
+                        test['test_object_run_id'],
+                        test.get('regression_run_id', regression_run_id)
                     )
-                    test['error_analysis'] = {
-                        'signature': error_sig.signature,
-                        'keywords': error_sig.error_keywords,
-                        'error_level': error_sig.error_level,
-                        'tool': error_sig.tool
-                    }
-                    test['log_file'] = log_path
-            except Exception as e:
-                test['error_analysis'] = {'error': str(e)}
+                    log_stat = await _run_blocking(_stat_log, log_path)
+                    if log_stat is not None:
+                        error_sig = await _run_blocking(
+                            _analyze_log,
+                            log_path,
+                            test.get('block_name'),
+                            test['test_name'],
+                            st=log_stat
+                        )
+                        test['error_analysis'] = {
+                            'signature': error_sig.signature,
+                            'keywords': error_sig.error_keywords,
+                            'error_level': error_sig.error_level,
+                            'tool': error_sig.tool
+                        }
+                        test['log_file'] = log_path
+                except Exception as e:
+                    test['error_analysis'] = {'error': str(e)}
+        
+        await asyncio.gather(*(analyze(test) for test in tests))
     
     return {
         'total_failed': len(tests),
@@ -371,10 +714,18 @@ async def get_test_details_tool(args: dict) -> dict:
     regression_run_id = args.get('regression_run_id')
     analyze_logs = args.get('analyze_logs', True)
     
-    test_info = db.get_test_by_name(
-        test_name,
-        regression_run_id=regression_run_id
-    )
+    if analyze_logs:
+        test_info, log_lookup = await _run_blocking(
+            _load_test_with_log,
+            test_name,
+            regression_run_id
+        )
+    else:
+        test_info, log_lookup = await _run_blocking(
+            db.get_test_by_name,
+            test_name,
+            regression_run_id=regression_run_id
+        ), None
     
     if not test_info:
         return {'error': f'Test {test_name} not found'}
@@ -382,15 +733,17 @@ async def get_test_details_tool(args: dict) -> dict:
     # Get log analysis if requested
     if analyze_logs and test_info.get('failed_job_run_ref'):
         try:
-            log_path = db.get_log_file_path(
-                test_info['test_object_run_id'],
-                test_info['regression_run_id']
-            )
-            if log_path and os.path.exists(log_path):
-                error_sig = log_analyzer.analyze_failure(
+            if log_lookup is None:
+                log_lookup = await _run_blocking(_resolve_log, test_info)
+            log_path, log_stat = log_lookup
+            
+            if log_stat is not None:
+                error_sig = await _run_blocking(
+                    _analyze_log,
                     log_path,
                     test_info.get('block_name'),
-                    test_name
+                    test_name,
+                    st=log_stat
                 )
                 test_info['error_analysis'] = error_sig.to_dict()
                 test_info['log_file'] = log_path
@@ -403,29 +756,32 @@ async def get_test_details_tool(args: dict) -> dict:
 async def get_regression_summary_tool(args: dict) -> dict:
     """Get regression run summary"""
     regression_run_id = args['regression_run_id']
-    return db.get_regression_summary(regression_run_id)
+    return await _run_blocking(db.get_regression_summary, regression_run_id)
 
 
 async def analyze_test_log_tool(args: dict) -> dict:
     """Analyze test log file"""
     test_name = args['test_name']
     regression_run_id = args['regression_run_id']
+    scan_mode = args.get('scan_mode', 'full')
     
-    # Get test info
-    test_info = db.get_test_by_name(test_name, regression_run_id=regression_run_id)
+    # Get test info and log file path
+    test_info, log_lookup = await _run_blocking(
+        _load_test_with_log,
+        test_name,
+        regression_run_id
+    )
     if not test_info:
         return {'error': f'Test {test_name} not found'}
     
-    # Get log file path
-    log_path = db.get_log_file_path(
-        test_info['test_object_run_id'],
-        regression_run_id
-    )
+    if log_lookup is None:
+        log_lookup = await _run_blocking(_resolve_log, test_info)
+    log_path, log_stat = log_lookup
     
     if not log_path:
         return {'error': 'Log file path not found in database'}
     
-    if not os.path.exists(log_path):
+    if log_stat is None:
         return {
             'error': 'Log file not accessible',
             'log_path': log_path,
@@ -434,17 +790,20 @@ async def analyze_test_log_tool(args: dict) -> dict:
         }
     
     # Analyze log
-    error_sig = log_analyzer.analyze_failure(
+    error_sig = await _run_blocking(
+        _analyze_log,
         log_path,
         test_info.get('block_name'),
-        test_name
+        test_name,
+        scan_mode,
+        st=log_stat
     )
     
     return {
         'test_name': test_name,
         'log_file': log_path,
         'analysis': error_sig.to_dict(),
-        'log_tail': log_analyzer.get_log_tail(log_path, num_lines=50)
+        'log_tail': await _run_blocking(log_analyzer.get_log_tail, log_path, num_lines=50)
     }
 
 
@@ -453,7 +812,7 @@ async def search_jira_issues_tool(args: dict) -> dict:
     jql = args['jql']
     max_results = args.get('max_results', 50)
     
-    issues = jira.search_issues(jql, max_results=max_results)
+    issues = await _cached_search(jql, max_results)
     return {
         'total': len(issues),
         'query': jql,
@@ -468,7 +827,8 @@ async def search_jira_by_text_tool(args: dict) -> dict:
     project_filter = args.get('project_filter')
     max_results = args.get('max_results', 20)
     
-    issues = jira.search_by_text(
+    issues = await _run_blocking(
+        jira.search_by_text,
         search_text,
         status_filter=status_filter,
         project_filter=project_filter,
@@ -487,9 +847,10 @@ async def get_jira_issue_tool(args: dict) -> dict:
     issue_key = args['issue_key']
     include_comments = args.get('include_comments', True)
     
-    issue = jira.get_issue(issue_key, include_comments=include_comments)
+    issue = await _cached_get_issue(issue_key, include_comments)
     if not issue:
         return {'error': f'Issue {issue_key} not found'}
+    issue = dict(issue)  # Cached; copy before adding fields
     
     # Extract solution
     solution = jira.extract_solution_from_issue(issue)
@@ -499,39 +860,43 @@ async def get_jira_issue_tool(args: dict) -> dict:
     return issue
 
 
-async def find_solutions_for_test_tool(args: dict) -> dict:
+async def _analyze_test_error(
+    test_info: dict,
+    test_name: str,
+    log_lookup: Optional[Tuple[Optional[str], Optional[os.stat_result]]] = None
+) -> Tuple[List[str], str, Optional[dict]]:
     """
-    🌟 ONE-CLICK SOLUTION FINDER
+    Determine a failed test's error signature and JIRA search keywords.
     
-    The most powerful tool - combines PostgreSQL query, log analysis,
-    and intelligent JIRA matching in one call.
-    """
-    test_name = args['test_name']
-    regression_run_id = args.get('regression_run_id')
-    max_jira_results = args.get('max_jira_results', 10)
-    
-    # Step 1: Get test info from database
-    test_info = db.get_test_by_name(test_name, regression_run_id=regression_run_id)
-    if not test_info:
-        return {'error': f'Test {test_name} not found'}
+    Analyzes the test's log file when available, falling back to keywords
+    derived from the test name.
     
-    # Step 2: Analyze log file
+    Args:
+        test_info: Test record from the database
+        test_name: Test name
+        log_lookup: (log_path, log_stat) if the caller already resolved the
+            log file (log_stat None if missing); looked up here when None
+        
+    Returns:
+        Tuple of (error_keywords, error_signature, log_analysis)
+    """
     error_keywords = []
     error_signature = ""
     log_analysis = None
     
     if test_info.get('failed_job_run_ref'):
         try:
-            log_path = db.get_log_file_path(
-                test_info['test_object_run_id'],
-                test_info['regression_run_id']
-            )
+            if log_lookup is None:
+                log_lookup = await _run_blocking(_resolve_log, test_info)
+            log_path, log_stat = log_lookup
             
-            if log_path and os.path.exists(log_path):
-                error_sig = log_analyzer.analyze_failure(
+            if log_stat is not None:
+                error_sig = await _run_blocking(
+                    _analyze_log,
                     log_path,
                     test_info.get('block_name'),
-                    test_name
+                    test_name,
+                    st=log_stat
                 )
                 error_keywords = error_sig.error_keywords
                 error_signature = error_sig.signature
@@ -547,22 +912,57 @@ async def find_solutions_for_test_tool(args: dict) -> dict:
         error_keywords = extract_keywords_from_test_name(test_name)
         error_signature = f"Test {test_name} failed"
     
+    return error_keywords, error_signature, log_analysis
+
+
+async def find_solutions_for_test_tool(args: dict) -> dict:
+    """
+    🌟 ONE-CLICK SOLUTION FINDER
+    
+    The most powerful tool - combines PostgreSQL query, log analysis,
+    and intelligent JIRA matching in one call.
+    """
+    test_name = args['test_name']
+    regression_run_id = args.get('regression_run_id')
+    max_jira_results = args.get('max_jira_results', 10)
+    
+    # Step 1: Get test info and log file from database
+    test_info, log_lookup = await _run_blocking(
+        _load_test_with_log,
+        test_name,
+        regression_run_id
+    )
+    if not test_info:
+        return {'error': f'Test {test_name} not found'}
+    
+    # Step 2: Analyze log file
+    error_keywords, error_signature, log_analysis = await _analyze_test_error(
+        test_info,
+        test_name,
+        log_lookup
+    )
+    
     # Step 3: Search JIRA
     jira_results = []
     if error_keywords:
         # Build JQL query
         jql = error_matcher.build_jira_jql(
-            keywords=error_keywords[:5],
+            keywords=_search_keywords(error_keywords[:5]),
             status_filter='Resolved'
         )
         
         try:
-            jira_results = jira.search_issues(jql, max_results=max_jira_results * 2)
+            jira_results = await _cached_search(
+                jql,
+                max_results=max_jira_results * 2,
+                fields=MATCH_FIELDS
+            )
         except Exception as e:
             jira_results = []
     
     # Step 4: Intelligent matching and ranking
-    matched_issues = error_matcher.match_jira_issues(
+    matched_issues = await _run_blocking(
+        error_matcher.match_jira_issues,
         error_signature,
         error_keywords,
         jira_results,
@@ -600,43 +1000,181 @@ async def batch_find_solutions_tool(args: dict) -> dict:
     """Batch find solutions for multiple failed tests"""
     regression_run_id = args['regression_run_id']
     limit = args.get('limit', 10)
+    concurrency = args.get('concurrency')
+    concurrency = BATCH_CONCURRENCY if concurrency is None else int(concurrency)
+    concurrency = min(max(concurrency, 1), MAX_BATCH_CONCURRENCY)
     
     # Get failed tests
-    failed_tests = db.query_failed_tests(
+    failed_tests = await _run_blocking(
+        db.query_failed_tests,
         regression_run_id=regression_run_id,
         limit=limit
     )
     
-    results = []
-    tests_with_solutions = 0
+    # Tests are independent, so each step below runs its per-test work
+    # concurrently (bounded, to avoid flooding the database and JIRA)
+    semaphore = asyncio.Semaphore(concurrency)
     
-    for test in failed_tests:
-        # Find solutions for each test
-        try:
-            solution_result = await find_solutions_for_test_tool({
-                'test_name': test['test_name'],
-                'regression_run_id': regression_run_id,
-                'max_jira_results': 5
-            })
+    async def bounded(coro):
+        async with semaphore:
+            return await coro
+    
+    # A test name repeated in the run (e.g. across shards) resolves to the
+    # same record and log, so steps 1-3 run once per distinct name
+    test_names = list(dict.fromkeys(test['test_name'] for test in failed_tests))
+    
+    # Step 1: Look up every test record
+    test_infos = await asyncio.gather(
+        *(
+            bounded(_run_blocking(
+                db.get_test_by_name,
+                test_name,
+                regression_run_id=regression_run_id
+            ))
+            for test_name in test_names
+        ),
+        return_exceptions=True
+    )
+    
+    # Step 2: Resolve all log paths with one query, then find which logs
+    # exist with one directory listing per log directory (only the logs
+    # found are stat()ed, and that stat is reused by the analysis)
+    with_logs = [
+        i for i, info in enumerate(test_infos)
+        if isinstance(info, dict) and info.get('failed_job_run_ref')
+    ]
+    log_lookups = {}
+    try:
+        log_paths = await _run_blocking(
+            db.get_log_file_paths,
+            [test_infos[i]['test_object_run_id'] for i in with_logs],
+            regression_run_id
+        )
+        log_stats = await _run_blocking(
+            _batch_stat,
+            [path for path in log_paths.values() if path]
+        )
+        for i in with_logs:
+            path = log_paths.get(test_infos[i]['test_object_run_id'])
+            log_lookups[i] = (path, log_stats.get(path))
+    except Exception:
+        # Leave lookups empty: the analysis step resolves each log itself
+        log_lookups = {}
+    
+    # Step 3: Analyze every test's log
+    async def analyze(i: int, test_name: str):
+        test_info = test_infos[i]
+        if isinstance(test_info, Exception):
+            raise test_info
+        if not test_info:
+            return None
+        return await _analyze_test_error(test_info, test_name, log_lookups.get(i))
+    
+    analyses = dict(zip(test_names, await asyncio.gather(
+        *(bounded(analyze(i, test_name)) for i, test_name in enumerate(test_names)),
+        return_exceptions=True
+    )))
+    
+    # Step 4: Search JIRA for the union of every test's top keywords, in a
+    # few bounded queries instead of one query per test. Keywords are taken
+    # rank by rank across tests, so if the union is trimmed every test keeps
+    # its strongest keywords.
+    ranked_keywords = list(dict.fromkeys(
+        kw.lower()
+        for rank in itertools.zip_longest(*(
+            analysis[0][:5]
+            for analysis in analyses.values() if isinstance(analysis, tuple)
+        ))
+        for kw in rank if kw
+    ))[:BATCH_JQL_MAX_KEYWORDS * BATCH_JQL_MAX_SEARCHES]
+    
+    jqls = [
+        error_matcher.build_jira_jql(
+            keywords=_search_keywords(ranked_keywords[i:i + BATCH_JQL_MAX_KEYWORDS]),
+            status_filter='Resolved'
+        )
+        for i in range(0, len(ranked_keywords), BATCH_JQL_MAX_KEYWORDS)
+    ]
+    max_results = min(
+        BATCH_JIRA_RESULTS_PER_TEST * len(failed_tests),
+        BATCH_JIRA_MAX_RESULTS
+    )
+    searches = await asyncio.gather(
+        *(_cached_search(jql, max_results=max_results, fields=MATCH_FIELDS) for jql in jqls),
+        return_exceptions=True
+    )
+    
+    # Merge the searches, dropping issues found by more than one
+    jira_results = []
+    seen_keys = set()
+    search_errors = []
+    for jql, issues in zip(jqls, searches):
+        if isinstance(issues, Exception):
+            logger.warning("Batch JIRA search failed (%s): %s", jql, issues)
+            search_errors.append(str(issues))
+            continue
+        for issue in issues:
+            if issue.get('key') not in seen_keys:
+                seen_keys.add(issue.get('key'))
+                jira_results.append(issue)
+    
+    # Step 5: Rank the shared candidates against each test locally. This is
+    # pure CPU work, so all tests are ranked in one worker-thread hop and the
+    # results are filled in by index, in failed_tests order.
+    def rank_all() -> List[dict]:
+        results = [None] * len(failed_tests)
+        # Issue texts and keyword sets are the same for every test
+        prepared = error_matcher.prepare_issues(jira_results)
+        # Repeated test names share one ranking
+        ranked = {}
+        
+        for i, test in enumerate(failed_tests):
+            analysis = analyses[test['test_name']]
+            if isinstance(analysis, Exception):
+                results[i] = {
+                    'test_name': test['test_name'],
+                    'has_solution': False,
+                    'error': str(analysis)
+                }
+                continue
+            
+            if analysis is None:
+                # Test record not found
+                results[i] = {
+                    'test_name': test['test_name'],
+                    'has_solution': False,
+                    'jira_matches': [],
+                    'error_keywords': []
+                }
+                continue
             
-            has_solution = len(solution_result.get('jira_matches', [])) > 0
-            if has_solution:
-                tests_with_solutions += 1
+            error_keywords, error_signature, _ = analysis
+            jira_matches = ranked.get(test['test_name'])
+            if jira_matches is None:
+                matched_issues = error_matcher.match_jira_issues(
+                    error_signature,
+                    error_keywords,
+                    jira_results,
+                    min_score=0.3,
+                    max_results=3,  # Top 3
+                    prepared=prepared
+                )
+                jira_matches = [match.to_dict() for match in matched_issues]
+                ranked[test['test_name']] = jira_matches
             
-            results.append({
-                'test_name': test['test_name'],
-                'has_solution': has_solution,
-                'jira_matches': solution_result.get('jira_matches', [])[:3],  # Top 3
-                'error_keywords': solution_result.get('error_analysis', {}).get('keywords', [])
-            })
-        except Exception as e:
-            results.append({
+            results[i] = {
                 'test_name': test['test_name'],
-                'has_solution': False,
-                'error': str(e)
-            })
+                'has_solution': len(jira_matches) > 0,
+                'jira_matches': jira_matches,
+                'error_keywords': error_keywords
+            }
+        
+        return results
     
-    return {
+    results = await _run_blocking(rank_all)
+    tests_with_solutions = sum(1 for result in results if result['has_solution'])
+    
+    response = {
         'regression_run_id': regression_run_id,
         'total_failed_tests': len(failed_tests),
         'processed': len(results),
@@ -644,6 +1182,10 @@ async def batch_find_solutions_tool(args: dict) -> dict:
         'tests_without_solutions': len(results) - tests_with_solutions,
         'results': results
     }
+    if search_errors:
+        response['jira_search_errors'] = search_errors
+    
+    return response
 
 
 async def list_regression_runs_tool(args: dict) -> dict:
@@ -651,7 +1193,7 @@ async def list_regression_runs_tool(args: dict) -> dict:
     project_name = args.get('project_name')
     limit = args.get('limit')  # None if not provided
     
-    runs = db.list_regression_runs(project_name=project_name, limit=limit)
+    runs = await _run_blocking(db.list_regression_runs, project_name=project_name, limit=limit)
     return {
         'total': len(runs),
         'project_filter': project_name,
@@ -660,13 +1202,27 @@ async def list_regression_runs_tool(args: dict) -> dict:
     }
 
 
+# Tool name -> implementation, used by call_tool for dispatch
+TOOL_HANDLERS = {
+    "query_failed_tests": query_failed_tests_tool,
+    "get_test_details": get_test_details_tool,
+    "get_regression_summary": get_regression_summary_tool,
+    "analyze_test_log": analyze_test_log_tool,
+    "search_jira_issues": search_jira_issues_tool,
+    "search_jira_by_text": search_jira_by_text_tool,
+    "get_jira_issue": get_jira_issue_tool,
+    "find_solutions_for_test": find_solutions_for_test_tool,
+    "batch_find_solutions": batch_find_solutions_tool,
+    "list_regression_runs": list_regression_runs_tool,
+}
+
+
 # ============================================================================
 # Server Lifecycle
 # ============================================================================
 
 def main():
     """Main entry point"""
-    import asyncio
     from mcp.server.stdio import stdio_server
     
     # Initialize clients
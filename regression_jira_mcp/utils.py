@@ -5,12 +5,13 @@ Helper functions for keyword extraction, text processing, and other utilities.
 """
 
 import re
-from typing import List, Set
+from functools import lru_cache
+from typing import FrozenSet, List, Set, Tuple
 from dataclasses import dataclass
 
 
 # Common noise words to filter out from keyword extraction
-NOISE_WORDS = {
+NOISE_WORDS = frozenset({
     'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
     'of', 'with', 'by', 'from', 'as', 'is', 'was', 'were', 'are', 'be',
     'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
@@ -20,7 +21,23 @@ NOISE_WORDS = {
     'every', 'both', 'few', 'more', 'most', 'other', 'some', 'such', 'no',
     'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 's',
     't', 'just', 'don', 'now', 've', 'll', 'm', 'o', 're', 'd', 'y'
+})
+
+# Patterns used by the helpers below, compiled once at import
+_WORD_RE = re.compile(r'\b[a-z0-9_]+\b')
+_CAMEL_RE = re.compile('([a-z])([A-Z])')
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9\s]')
+
+# ASCII lowercase + non-alphanumeric → space, in one str.translate pass
+_ASCII_CLEAN_TABLE = {
+    i: chr(i).lower() if chr(i).isalnum() else ' ' for i in range(128)
 }
+_JQL_TEXT_RE = re.compile(r'text\s*~\s*["\']([^"\']+)["\']', re.IGNORECASE)
+_JQL_SUMMARY_RE = re.compile(r'summary\s*~\s*["\']([^"\']+)["\']', re.IGNORECASE)
+_INVALID_FILENAME_RE = re.compile(r'[<>:"/\\|?*]')
+
+# Longest text whose extracted keywords are memoized
+KEYWORD_CACHE_MAX_TEXT = 1024
 
 
 def extract_keywords(text: str, max_keywords: int = 10) -> List[str]:
@@ -37,27 +54,42 @@ def extract_keywords(text: str, max_keywords: int = 10) -> List[str]:
     if not text:
         return []
     
+    # Error signatures and summaries repeat across tests; cache short texts
+    # only, so large issue bodies aren't kept alive by the cache
+    if len(text) <= KEYWORD_CACHE_MAX_TEXT:
+        return list(_cached_keywords(text, max_keywords))
+    return _extract_keywords(text, max_keywords)
+
+
+@lru_cache(maxsize=2048)
+def _cached_keywords(text: str, max_keywords: int) -> Tuple[str, ...]:
+    """Cached form of extract_keywords() for short texts."""
+    return tuple(_extract_keywords(text, max_keywords))
+
+
+def _extract_keywords(text: str, max_keywords: int) -> List[str]:
+    """Uncached implementation of extract_keywords()."""
     # Convert to lowercase
     text = text.lower()
     
-    # Extract words (alphanumeric sequences)
-    words = re.findall(r'\b[a-z0-9_]+\b', text)
+    # Extract words (alphanumeric sequences) lazily, so scanning stops once
+    # max_keywords are found instead of tokenizing all of a large text
+    words = (match.group() for match in _WORD_RE.finditer(text))
     
-    # Filter out noise words and short words
+    # Filter out noise words and short words (short pure numbers are
+    # covered by the length check). Bound methods are hoisted out of the loop.
     keywords = []
     seen = set()
+    add_seen = seen.add
+    append = keywords.append
     
     for word in words:
-        # Skip if already seen, too short, or is noise
-        if word in seen or len(word) <= 2 or word in NOISE_WORDS:
+        # Skip if too short, is noise, or already seen
+        if len(word) <= 2 or word in NOISE_WORDS or word in seen:
             continue
         
-        # Skip pure numbers unless they look like error codes
-        if word.isdigit() and len(word) < 3:
-            continue
-            
-        seen.add(word)
-        keywords.append(word)
+        add_seen(word)
+        append(word)
         
         if len(keywords) >= max_keywords:
             break
@@ -82,6 +114,14 @@ def extract_keywords_from_test_name(test_name: str) -> List[str]:
     if not test_name:
         return []
     
+    # Test names repeat across a regression batch; the cached tuple is
+    # copied so callers can still modify the returned list
+    return list(_test_name_keywords(test_name))
+
+
+@lru_cache(maxsize=4096)
+def _test_name_keywords(test_name: str) -> Tuple[str, ...]:
+    """Cached implementation of extract_keywords_from_test_name()."""
     # Remove common test prefixes
     name = test_name.lower()
     for prefix in ['test_', 'tc_', 'testcase_']:
@@ -91,7 +131,7 @@ def extract_keywords_from_test_name(test_name: str) -> List[str]:
     
     # Split on underscores and camelCase
     # First handle camelCase
-    name = re.sub('([a-z])([A-Z])', r'\1_\2', name)
+    name = _CAMEL_RE.sub(r'\1_\2', name)
     
     # Split on underscores
     parts = name.split('_')
@@ -103,7 +143,7 @@ def extract_keywords_from_test_name(test_name: str) -> List[str]:
         if len(part) > 2 and part not in NOISE_WORDS:
             keywords.append(part)
     
-    return keywords
+    return tuple(keywords)
 
 
 def clean_text_for_comparison(text: str) -> str:
@@ -119,11 +159,14 @@ def clean_text_for_comparison(text: str) -> str:
     if not text:
         return ""
     
+    if text.isascii():
+        return ' '.join(text.translate(_ASCII_CLEAN_TABLE).split())
+    
     # Convert to lowercase
     text = text.lower()
     
     # Remove special characters but keep spaces
-    text = re.sub(r'[^a-z0-9\s]', ' ', text)
+    text = _NON_ALNUM_RE.sub(' ', text)
     
     # Normalize whitespace
     text = ' '.join(text.split())
@@ -213,16 +256,16 @@ def parse_jql_for_keywords(jql: str) -> List[str]:
     keywords = []
     
     # Look for text search patterns: text ~ "keyword"
-    text_matches = re.findall(r'text\s*~\s*["\']([^"\']+)["\']', jql, re.IGNORECASE)
+    text_matches = _JQL_TEXT_RE.findall(jql)
     for match in text_matches:
         keywords.extend(match.split())
     
     # Look for summary search: summary ~ "keyword"
-    summary_matches = re.findall(r'summary\s*~\s*["\']([^"\']+)["\']', jql, re.IGNORECASE)
+    summary_matches = _JQL_SUMMARY_RE.findall(jql)
     for match in summary_matches:
         keywords.extend(match.split())
     
-    return list(set(keywords))  # Remove duplicates
+    return list(dict.fromkeys(keywords))  # Remove duplicates, keep order
 
 
 def estimate_token_count(text: str) -> int:
@@ -253,14 +296,13 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         Sanitized filename
     """
-    # Remove or replace invalid characters
-    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
-    
-    # Limit length
+    # Limit length first; the substitution below is one character for one,
+    # so the result is the same without scanning the rest of a long string
     if len(filename) > 200:
         filename = filename[:200]
     
-    return filename
+    # Remove or replace invalid characters
+    return _INVALID_FILENAME_RE.sub('_', filename)
 
 
 def create_jira_url(base_url: str, issue_key: str) -> str:
@@ -280,11 +322,14 @@ def create_jira_url(base_url: str, issue_key: str) -> str:
     return f"{base_url}/browse/{issue_key}"
 
 
-@dataclass
+@dataclass(frozen=True)
 class SimilarityScore:
     """Container for similarity comparison results"""
+    # One is built per (test, issue) pair; slots by hand for Python < 3.10
+    __slots__ = ('score', 'matching_keywords', 'total_keywords')
+    
     score: float  # 0.0 to 1.0
-    matching_keywords: List[str]
+    matching_keywords: Tuple[str, ...]
     total_keywords: int
     
     def __str__(self):
@@ -303,28 +348,56 @@ def calculate_keyword_similarity(keywords1: List[str], keywords2: List[str]) ->
     Returns:
         SimilarityScore object
     """
-    if not keywords1 or not keywords2:
-        return SimilarityScore(score=0.0, matching_keywords=[], total_keywords=0)
+    return keyword_set_similarity(keyword_set(keywords1), keyword_set(keywords2))
+
+
+def keyword_set(keywords: List[str]) -> FrozenSet[str]:
+    """
+    Normalize keywords for keyword_set_similarity().
+    
+    Callers comparing one keyword list against many can build its set once.
+    
+    Args:
+        keywords: Keywords
+        
+    Returns:
+        Frozenset of lowercased keywords
+    """
+    return frozenset(k.lower() for k in keywords)
+
+
+def keyword_set_similarity(set1: FrozenSet[str], set2: FrozenSet[str]) -> SimilarityScore:
+    """
+    Calculate Jaccard similarity between two normalized keyword sets.
     
-    set1 = set(k.lower() for k in keywords1)
-    set2 = set(k.lower() for k in keywords2)
+    Args:
+        set1: First keyword set (from keyword_set())
+        set2: Second keyword set (from keyword_set())
+        
+    Returns:
+        SimilarityScore object
+    """
+    if not set1 or not set2:
+        return SimilarityScore(score=0.0, matching_keywords=(), total_keywords=0)
     
-    matching = set1.intersection(set2)
-    union = set1.union(set2)
+    matching = set1 & set2
     
-    if not union:
-        score = 0.0
-    else:
-        # Jaccard similarity
-        score = len(matching) / len(union)
+    # Union size is |A| + |B| - |A & B|; no need to build the union set
+    union_size = len(set1) + len(set2) - len(matching)
     
     return SimilarityScore(
-        score=score,
-        matching_keywords=sorted(list(matching)),
-        total_keywords=len(union)
+        score=len(matching) / union_size,
+        matching_keywords=tuple(sorted(matching)),
+        total_keywords=union_size
     )
 
 
+@lru_cache(maxsize=1024)
+def _highlight_pattern(keywords: Tuple[str, ...]) -> re.Pattern:
+    """Case-insensitive alternation of keywords, longest first (cached)."""
+    return re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE)
+
+
 def highlight_keywords(text: str, keywords: List[str], marker: str = "**") -> str:
     """
     Highlight keywords in text using markers.
@@ -340,10 +413,7 @@ def highlight_keywords(text: str, keywords: List[str], marker: str = "**") -> st
     if not keywords:
         return text
     
-    result = text
-    for keyword in sorted(keywords, key=len, reverse=True):  # Longest first
-        # Case-insensitive replacement
-        pattern = re.compile(re.escape(keyword), re.IGNORECASE)
-        result = pattern.sub(f"{marker}\\g<0>{marker}", result)
-    
-    return result
+    # One case-insensitive pass; longest keywords first so the alternation
+    # prefers e.g. "segfault" over "fault" at the same position
+    pattern = _highlight_pattern(tuple(sorted(set(keywords), key=lambda k: (-len(k), k))))
+    return pattern.sub(f"{marker}\\g<0>{marker}", text)
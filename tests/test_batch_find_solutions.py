@@ -0,0 +1,126 @@
+"""
+Checks for batch_find_solutions_tool with the database and JIRA faked out.
+"""
+
+import asyncio
+
+import pytest
+from cachetools import TTLCache
+
+from regression_jira_mcp import server
+from regression_jira_mcp.error_matcher import ErrorMatcher
+
+
+class FakeDB:
+    """Regression database returning one record per failed test."""
+
+    def __init__(self, test_names):
+        self.test_names = test_names
+        self.lookups = []
+
+    def query_failed_tests(self, regression_run_id, limit=10):
+        return [{'test_name': name} for name in self.test_names]
+
+    def get_test_by_name(self, test_name, regression_run_id=None, include_log_path=False):
+        self.lookups.append(test_name)
+        return {'test_name': test_name, 'test_object_run_id': len(self.lookups)}
+
+    def get_log_file_paths(self, test_object_run_ids, regression_run_id):
+        return {}
+
+
+class FakeJira:
+    """JIRA client failing every search that mentions `fail_keyword`."""
+
+    def __init__(self, issues, fail_keyword=None):
+        self.issues = issues
+        self.fail_keyword = fail_keyword
+        self.jqls = []
+
+    def search_issues(self, jql, max_results=50, fields=None):
+        self.jqls.append(jql)
+        if self.fail_keyword and self.fail_keyword in jql:
+            raise RuntimeError('JIRA search timed out')
+        return self.issues
+
+
+def _keywords(test_name):
+    return [f'{test_name}kw{rank}' for rank in range(5)]
+
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    """Wire fakes into the server and record every log analysis."""
+    state = {'analyzed': [], 'in_flight': 0, 'peak': 0}
+
+    async def fake_analyze(test_info, test_name, log_lookup=None):
+        state['analyzed'].append(test_name)
+        state['in_flight'] += 1
+        state['peak'] = max(state['peak'], state['in_flight'])
+        await asyncio.sleep(0.01)
+        state['in_flight'] -= 1
+        return _keywords(test_name), f'ERROR: {test_name} failed', None
+
+    def install(test_names, jira):
+        monkeypatch.setattr(server, 'db', FakeDB(test_names))
+        monkeypatch.setattr(server, 'jira', jira)
+        monkeypatch.setattr(server, 'error_matcher', ErrorMatcher())
+        monkeypatch.setattr(server, 'jira_search_cache', TTLCache(maxsize=256, ttl=60))
+        monkeypatch.setattr(server, '_analyze_test_error', fake_analyze)
+        return state
+
+    return install
+
+
+def _run(args):
+    return asyncio.run(server.batch_find_solutions_tool(args))
+
+
+def test_duplicate_test_names_analyzed_once(fake_server):
+    names = ['dma', 'pcie', 'dma', 'dma', 'pcie']
+    state = fake_server(names, FakeJira([]))
+
+    response = _run({'regression_run_id': 1})
+
+    assert sorted(state['analyzed']) == ['dma', 'pcie']
+    assert sorted(server.db.lookups) == ['dma', 'pcie']
+    assert [result['test_name'] for result in response['results']] == names
+    assert response['processed'] == len(names)
+
+
+def test_failed_search_reported_without_aborting(fake_server):
+    # 10 tests x 5 keywords need two JQL searches; the one holding the
+    # lowest-ranked keywords fails
+    names = [f't{i}' for i in range(10)]
+    issue = {
+        'key': 'PROJ-1',
+        'summary': 'ERROR: t0 failed',
+        'description': ' '.join(_keywords('t0')),
+        'status': 'Resolved',
+    }
+    jira = FakeJira([issue], fail_keyword='kw4')
+    fake_server(names, jira)
+
+    response = _run({'regression_run_id': 1})
+
+    assert len(jira.jqls) == 2
+    assert response['jira_search_errors'] == ['JIRA search timed out']
+    assert response['processed'] == len(names)
+    matches = response['results'][0]['jira_matches']
+    assert [match['issue_key'] for match in matches] == ['PROJ-1']
+
+
+@pytest.mark.parametrize('concurrency, expected_peak', [
+    (None, server.BATCH_CONCURRENCY),
+    (0, 1),
+    (-5, 1),
+    ('3', 3),
+    (1000, server.MAX_BATCH_CONCURRENCY),
+])
+def test_concurrency_is_clamped(fake_server, concurrency, expected_peak):
+    names = [f't{i}' for i in range(40)]
+    state = fake_server(names, FakeJira([]))
+
+    _run({'regression_run_id': 1, 'limit': 40, 'concurrency': concurrency})
+
+    assert state['peak'] == expected_peak
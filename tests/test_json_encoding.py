@@ -0,0 +1,34 @@
+"""
+Checks that the orjson and stdlib JSON encoders produce the same output.
+"""
+
+from datetime import date, datetime
+
+import pytest
+
+from regression_jira_mcp import server
+
+
+PAYLOAD = {
+    'test_name': 'test_dma_timeout',
+    'status': 'FAILED',
+    'run_date': datetime(2024, 5, 17, 8, 30, 15),
+    'build_date': date(2024, 5, 16),
+    'error_signature': 'ERROR: 超时 in dma_engine',
+    'jira_matches': [
+        {'key': 'PROJ-123', 'similarity_score': 0.85, 'matching_keywords': ['dma', 'timeout']},
+        {'key': 'PROJ-456', 'similarity_score': 0.3333333333333333, 'matching_keywords': []},
+    ],
+    'line_number': 1042,
+    'stats': {3: 'level three'},
+    'log_file': None,
+    'has_solution': True,
+}
+
+
+@pytest.mark.skipif(not server.ORJSON_AVAILABLE, reason='orjson not installed')
+@pytest.mark.parametrize('compact', [False, True])
+def test_orjson_matches_stdlib(compact):
+    expected = server._encode_json_stdlib(PAYLOAD, compact=compact)
+
+    assert server._encode_json_orjson(PAYLOAD, compact=compact) == expected
@@ -0,0 +1,24 @@
+"""
+Regression checks for log_analyzer line handling.
+"""
+
+from regression_jira_mcp.log_analyzer import LogAnalyzer
+
+
+CR_LOG = b'start\nprogress 1%\rprogress 50%\rprogress 100%\nline\nERROR: boom\n'
+
+
+def test_lone_cr_ends_a_line(tmp_path):
+    """A lone '\\r' (progress output) ends a line, as in text mode."""
+    log = tmp_path / 'cr.log'
+    log.write_bytes(CR_LOG)
+    analyzer = LogAnalyzer()
+
+    sig = analyzer.analyze_failure(str(log))
+
+    assert sig.line_number == 6
+    assert sig.error_line == 'ERROR: boom\n'
+    assert sig.signature == 'ERROR: boom'
+
+    context = analyzer.get_error_context(str(log), sig.line_number, context_lines=0)
+    assert context == f">>> {sig.line_number:5d}: {sig.error_line.rstrip()}"
@@ -0,0 +1,55 @@
+"""
+Table-driven checks for the read-only query and JIRA operation validators.
+"""
+
+import pytest
+
+from regression_jira_mcp.security import (
+    QueryValidator,
+    SecurityError,
+    validate_jira_operation,
+)
+
+
+REJECTED_QUERIES = [
+    'DROP TABLE regression_run',
+    'drop table regression_run',
+    'Delete FROM test_object_run WHERE id = 1',
+    'uPdAtE regression_run SET status = 1',
+    'insert into regression_run VALUES (1)',
+    "COPY regression_run FROM '/tmp/runs.csv'",
+    "copy regression_run from program 'cat /etc/passwd'",
+    "SELECT * FROM t INTO OUTFILE '/tmp/t.csv'",
+    "LOAD DATA INFILE '/tmp/t.csv' INTO TABLE t",
+    'SELECT 1 /* DROP TABLE regression_run */',
+    'SELECT 1 -- delete everything',
+    'SELECT 1;\nTRUNCATE regression_run',
+]
+
+ALLOWED_QUERIES = [
+    '',
+    'SELECT * FROM regression_run',
+    'select updated_at, deleted_flag, inserted_by from test_object_run',
+    "SELECT note FROM t WHERE note = 'copy'",
+    "SELECT 'copy'\nFROM t",
+    'SELECT id FROM regression_run WHERE dropped_count > 0',
+]
+
+
+@pytest.mark.parametrize('query', REJECTED_QUERIES)
+def test_write_queries_rejected(query):
+    with pytest.raises(SecurityError):
+        QueryValidator.validate(query)
+
+
+@pytest.mark.parametrize('query', ALLOWED_QUERIES)
+def test_read_queries_allowed(query):
+    QueryValidator.validate(query)
+
+
+def test_jira_operations():
+    validate_jira_operation('search_issues')
+    # Rejections are not memoized, so repeated attempts keep raising
+    for _ in range(2):
+        with pytest.raises(SecurityError):
+            validate_jira_operation('create_issue')